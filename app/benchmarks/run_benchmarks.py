@@ -0,0 +1,229 @@
+"""
+Benchmarks do algoritmo genético e do pipeline de dados.
+
+Uso (a partir de app/):
+
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --sizes 10 50 --baseline bench.json
+
+Os dados sintéticos e o `random` do algoritmo usam sementes fixas, então duas
+execuções no mesmo commit medem exatamente o mesmo trabalho.
+"""
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+import statistics
+import subprocess
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+from typing import Callable
+from benchmarks.synthetic import make_problem, make_combined_matrix, trip_dates
+from core.utils.file_utils import FileUtils
+from core.api.google.routes_api import RoutesClient
+from core.genetic.crossover import CROSSOVER_OPERATORS
+from core.genetic.seeding import seed_individuals
+from core.genetic.telemetry import HistoryRecorder
+from core.genetic.genetic_algorithm import TravelGeneticAlgorithm
+
+DEFAULT_SIZES = [10, 50, 200, 1000]
+DEFAULT_SEED = 42
+GA_PARAMS = dict(
+    population_size=50,
+    generations=20,
+    mutation_rate=0.1,
+    crossover_rate=0.8,
+    time_min_daily=480,
+)
+# Fração da população semeada por heurísticas na comparação com a população aleatória
+SEED_RATIO = 0.1
+
+
+def time_call(func: Callable[[], object], repeat: int, setup: Callable[[], None] | None = None) -> list[float]:
+    """
+    Executa `func` `repeat` vezes e retorna os tempos em segundos. `setup`
+    roda antes de cada execução, fora da medição.
+    """
+    tempos = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        inicio = time.perf_counter()
+        func()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def generations_to_reach(history: list[dict], fitness: float) -> int | None:
+    """
+    Número de gerações até o melhor fitness alcançar `fitness` (None se não alcançar).
+    """
+    for geracao, stats in enumerate(history):
+        if stats["best_fitness"] >= fitness:
+            return geracao + 1
+    return None
+
+
+def run_suite(sizes: list[int], repeat: int, seed: int, fitness_mode: str) -> list[dict]:
+    resultados = []
+
+    def registrar(nome: str, tamanho: int, tempos: list[float], **extra) -> None:
+        resultado = {
+            "name": nome,
+            "size": tamanho,
+            "repeat": len(tempos),
+            "min_ms": round(min(tempos) * 1000, 4),
+            "median_ms": round(statistics.median(tempos) * 1000, 4),
+            "mean_ms": round(statistics.fmean(tempos) * 1000, 4),
+            **extra,
+        }
+        resultados.append(resultado)
+        print(f"{nome:<32} n={tamanho:<5} min {resultado['min_ms']:>10.3f} ms  "
+              f"median {resultado['median_ms']:>10.3f} ms", file=sys.stderr)
+
+    for tamanho in sizes:
+        places, duration, distance = make_problem(tamanho, seed)
+        start_date, end_date = trip_dates(tamanho)
+
+        def build_ga(**params) -> TravelGeneticAlgorithm:
+            return TravelGeneticAlgorithm(places, duration, distance,
+                                          start_date=start_date, end_date=end_date,
+                                          fitness_mode=fitness_mode,
+                                          **{**GA_PARAMS, **params})
+
+        def reseed() -> None:
+            random.seed(seed)
+
+        # Cada repetição usa uma instância nova: o cache de fitness de uma
+        # execução anterior esconderia o custo das avaliações
+        ga = None
+        melhores = []
+
+        def novo_ga(**params) -> Callable[[], None]:
+            def setup() -> None:
+                nonlocal ga
+                ga = build_ga(**params)
+                reseed()
+            return setup
+
+        def run_ga() -> None:
+            melhores.append(ga.run()["melhor_fitness"])
+
+        registrar("TravelGeneticAlgorithm.run", tamanho, time_call(run_ga, repeat, novo_ga()),
+                  fitness_mode=fitness_mode, best_fitness=melhores[-1])
+
+        # Mesma execução com parte da população semeada por heurísticas: compara
+        # o fitness final e quantas gerações levou para chegar ao da aleatória
+        historico = HistoryRecorder()
+        semeados = []
+
+        def run_seeded_ga() -> None:
+            semeados.append(ga.run()["melhor_fitness"])
+
+        tempos = time_call(run_seeded_ga, repeat, novo_ga(seed_ratio=SEED_RATIO, observers=[historico]))
+        geracoes = generations_to_reach(historico.history, melhores[-1])
+        registrar("TravelGeneticAlgorithm.run[seeded]", tamanho, tempos,
+                  fitness_mode=fitness_mode, seed_ratio=SEED_RATIO, best_fitness=semeados[-1],
+                  generations_to_unseeded_best=geracoes)
+        print(f"{'':<32} seeded best {semeados[-1]:.0f} vs {melhores[-1]:.0f}, "
+              f"unseeded best reached after {geracoes} generation(s)", file=sys.stderr)
+
+        quantidade = round(SEED_RATIO * GA_PARAMS["population_size"])
+        registrar("seed_individuals", tamanho,
+                  time_call(lambda: seed_individuals(ga.problem, GA_PARAMS["time_min_daily"], quantidade), repeat, reseed))
+
+        # Sem cache de fitness, para medir a avaliação completa da população
+        ga = build_ga(fitness_cache_size=0)
+        reseed()
+        ga.population = ga._initialize_population()
+        registrar("_evaluate_fitness", tamanho, time_call(ga._evaluate_fitness, repeat),
+                  fitness_mode=fitness_mode)
+
+        for operador in CROSSOVER_OPERATORS:
+            ga = build_ga(crossover_rate=1.0, crossover_operator=operador)
+            reseed()
+            pais = ga._initialize_population()
+            indices = list(range(len(pais)))
+            registrar(f"_apply_crossover[{operador}]", tamanho,
+                      time_call(lambda: ga._apply_crossover(pais, indices, ga.buffers.next), repeat, reseed))
+
+        registrar("FileUtils._validate_schema", tamanho,
+                  time_call(lambda: FileUtils._validate_schema(places), repeat))
+
+        routes_client = RoutesClient(use_cache=False)
+        combined_matrix = make_combined_matrix(duration, distance)
+        registrar("RoutesClient._split_matrix", tamanho,
+                  time_call(lambda: routes_client._split_matrix(combined_matrix), repeat))
+
+    return resultados
+
+
+def compare(resultados: list[dict], baseline: dict) -> None:
+    """
+    Mostra a razão entre os tempos medianos atuais e os de uma execução anterior.
+    """
+    anteriores = {(r["name"], r["size"]): r for r in baseline["results"]}
+    print(f"\nComparação com {baseline['meta'].get('commit', '?')} (mediana atual / anterior):")
+    for resultado in resultados:
+        anterior = anteriores.get((resultado["name"], resultado["size"]))
+        if anterior is None or not anterior["median_ms"]:
+            continue
+        razao = resultado["median_ms"] / anterior["median_ms"]
+        print(f"  {resultado['name']:<32} n={resultado['size']:<5} {razao:6.2f}x")
+
+
+def _metadata(args: argparse.Namespace) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "fitness_mode": args.fitness_mode,
+        "ga_params": GA_PARAMS,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--fitness-mode", default="scalar")
+    parser.add_argument("--output", help="Arquivo JSON com os resultados")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparação")
+    args = parser.parse_args(argv)
+
+    # O algoritmo registra cada geração em INFO
+    logging.getLogger().setLevel(logging.WARNING)
+
+    resultados = run_suite(args.sizes, args.repeat, args.seed, args.fitness_mode)
+    relatorio = {"meta": _metadata(args), "results": resultados}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(relatorio, f, indent=2)
+    else:
+        json.dump(relatorio, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(resultados, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from core.utils.geo_utils import GeoUtils
+from core.utils.data_frame_utils import DataFrameUtils
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+# Horários sorteados para os locais sintéticos (inclui fechado, 24h e vários intervalos)
+OPENING_HOURS = [
+    "09:00-18:00",
+    "10:00-17:00",
+    "08:00-12:00",
+    "00:00-23:59",
+    "Open 24 hours",
+    "09:00-12:00,14:00-18:00",
+    "Closed",
+]
+# Centro dos locais sintéticos (Kyoto) e raio aproximado em graus (~10 km)
+CENTER = (35.0116, 135.7681)
+SPREAD_DEGREES = 0.09
+WALK_SPEED_KMH = 4.5
+# Data de início fixa para que o dia da semana de cada dia do roteiro não varie
+START_DATE = datetime(2025, 10, 6)
+
+
+def make_places(size: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Gera `size` locais sintéticos no formato do CSV de entrada (sem o HOTEL).
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "places": [f"Place {i}" for i in range(size)],
+        "latitude": CENTER[0] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES, size),
+        "longitude": CENTER[1] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES, size),
+        **{day: rng.choice(OPENING_HOURS, size) for day in WEEKDAYS},
+        "estimated_duration_min": rng.integers(20, 181, size),
+        "priority": rng.integers(0, 2, size),
+    })
+
+
+def make_problem(size: int, seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Gera locais (com o HOTEL na primeira linha) e matrizes de duração (minutos)
+    e distância (metros) a partir da distância em linha reta com ruído.
+    """
+    rng = np.random.default_rng(seed)
+    places = make_places(size, seed)
+    places = DataFrameUtils.concatenate_dataframe(CENTER, places)
+
+    distance_km = GeoUtils.haversine_matrix_km(places["latitude"], places["longitude"])
+    distance_km *= rng.uniform(1.1, 1.5, distance_km.shape)
+    np.fill_diagonal(distance_km, 0)
+    names = places["places"]
+    duration = pd.DataFrame((distance_km / WALK_SPEED_KMH * 60).astype(np.int64), index=names, columns=names)
+    distance = pd.DataFrame((distance_km * 1000).astype(np.int64), index=names, columns=names)
+    return places, duration, distance
+
+
+def make_combined_matrix(duration: pd.DataFrame, distance: pd.DataFrame) -> pd.DataFrame:
+    """
+    Matriz de tuplas (duração, distância), como a montada pelo RoutesClient.
+    """
+    pairs = [list(zip(d, m)) for d, m in zip(duration.to_numpy().tolist(), distance.to_numpy().tolist())]
+    return pd.DataFrame(pairs, index=duration.index, columns=duration.columns)
+
+
+def trip_dates(size: int) -> tuple[datetime, datetime]:
+    """
+    Datas da viagem: cerca de 4 locais por dia, para que o roteiro use todos os genes.
+    """
+    days = max(2, size // 4)
+    return START_DATE, START_DATE + timedelta(days=days - 1)
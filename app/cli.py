@@ -0,0 +1,218 @@
+"""
+Planejador em lote, sem interface: lê especificações de viagem e grava um
+resultado JSON por linha.
+
+Uso (a partir de app/):
+
+    python cli.py trips.jsonl --output results.jsonl --workers 4
+    python cli.py trips/ --output results.jsonl --matrix-provider estimate
+
+A entrada é um arquivo JSONL (uma viagem por linha) ou um diretório com
+arquivos .json/.jsonl. Cada viagem é um objeto como:
+
+    {"id": "osaka", "places_csv": "data/Osaka_Places.csv", "hotel": "Hotel XYZ",
+     "hotel_coordinates": [34.67, 135.50], "start_date": "2025-10-06",
+     "end_date": "2025-10-08", "matrix_provider": "routes", "seed": 42,
+     "ga": {"population_size": 50, "generations": 100, "time_limit": 480}}
+
+No lugar de `places_csv` pode vir `destination` (sugestões da OpenAI, com
+`temperature` e `top_p`). Caminhos relativos de `places_csv` são resolvidos a
+partir do arquivo da especificação. `hotel_coordinates` é opcional e evita a
+geocodificação do hotel.
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from core.genetic.telemetry import JsonlExporter
+from core.genetic.genetic_algorithm import EXPERIMENTAL_FITNESS_MODES
+from core.services.travel_planner_controller import TravelPlannerController
+
+# Parâmetros do algoritmo genético usados quando a especificação não os informa
+DEFAULT_GA_PARAMS = {
+    "population_size": 50,
+    "generations": 100,
+    "mutation_rate": 0.1,
+    "crossover_rate": 0.8,
+    "time_limit": 240,
+    "fitness_mode": "scalar",
+    "islands": 1,
+    "local_search_budget_ms": 0,
+    "crossover_operator": "ox",
+    "time_budget_ms": 0,
+    "adaptive": False,
+    "seed_ratio": 0.0,
+}
+
+
+def load_specs(path: str) -> list[dict]:
+    """
+    Lê as especificações de um arquivo JSONL/JSON ou de todos os .json/.jsonl
+    de um diretório (em ordem alfabética). Cada especificação recebe `id`
+    (nome do arquivo e linha, se ausente) e `base_dir`.
+    """
+    if os.path.isdir(path):
+        arquivos = [os.path.join(path, nome) for nome in sorted(os.listdir(path))
+                    if nome.endswith((".json", ".jsonl"))]
+    else:
+        arquivos = [path]
+
+    specs = []
+    for arquivo in arquivos:
+        nome = os.path.splitext(os.path.basename(arquivo))[0]
+        with open(arquivo, encoding="utf-8") as f:
+            if arquivo.endswith(".json"):
+                conteudo = json.load(f)
+                registros = conteudo if isinstance(conteudo, list) else [conteudo]
+            else:
+                registros = [json.loads(linha) for linha in f if linha.strip()]
+
+        for i, spec in enumerate(registros):
+            spec.setdefault("id", nome if len(registros) == 1 else f"{nome}:{i + 1}")
+            spec.setdefault("base_dir", os.path.dirname(os.path.abspath(arquivo)))
+            specs.append(spec)
+    return specs
+
+
+def plan_trip(spec: dict, telemetry_dir: str | None = None) -> dict:
+    """
+    Planeja uma viagem com a mesma lógica da interface (TravelPlannerController).
+    Erros são devolvidos no resultado para não interromper o lote.
+    """
+    inicio = time.perf_counter()
+    try:
+        if "seed" in spec:
+            random.seed(spec["seed"])
+
+        controller = TravelPlannerController()
+        start_date = datetime.fromisoformat(spec["start_date"])
+        end_date = datetime.fromisoformat(spec.get("end_date", spec["start_date"]))
+        matrix_provider = spec.get("matrix_provider", "routes")
+        hotel_coordinates = tuple(spec["hotel_coordinates"]) if spec.get("hotel_coordinates") else None
+
+        if "places_csv" in spec:
+            places_csv = os.path.join(spec.get("base_dir", ""), spec["places_csv"])
+            df_places, df_duration, df_distance = controller.handle_file_upload(places_csv,
+                                                                                spec.get("hotel", ""),
+                                                                                matrix_provider,
+                                                                                hotel_coordinates)
+        elif "destination" in spec:
+            df_places, df_duration, df_distance, hotel_coordinates = controller.handle_text_input(
+                spec["destination"],
+                spec.get("hotel", ""),
+                start_date,
+                end_date,
+                spec.get("temperature", 0.0),
+                spec.get("top_p", 1.0),
+                matrix_provider,
+            )
+        else:
+            raise ValueError("Trip spec needs 'places_csv' or 'destination'")
+
+        ga = {**DEFAULT_GA_PARAMS, **spec.get("ga", {})}
+        observers = None
+        if telemetry_dir:
+            nome = "".join(c if c.isalnum() or c in "-_." else "_" for c in str(spec["id"]))
+            observers = [JsonlExporter(os.path.join(telemetry_dir, f"{nome}.jsonl"))]
+
+        resultado = controller.run_genetic_algorithm(df_places,
+                                                     df_duration,
+                                                     df_distance,
+                                                     ga["population_size"],
+                                                     ga["generations"],
+                                                     ga["mutation_rate"],
+                                                     ga["crossover_rate"],
+                                                     ga["time_limit"],
+                                                     start_date,
+                                                     end_date,
+                                                     ga["fitness_mode"],
+                                                     ga["islands"],
+                                                     ga["local_search_budget_ms"],
+                                                     ga["crossover_operator"],
+                                                     ga["time_budget_ms"],
+                                                     ga["adaptive"],
+                                                     ga["seed_ratio"],
+                                                     observers)
+        return {
+            "id": spec["id"],
+            "status": "ok",
+            "elapsed_s": round(time.perf_counter() - inicio, 3),
+            "hotel_coordinates": hotel_coordinates,
+            "result": resultado,
+        }
+    except Exception as e:
+        logging.exception(f"Error planning trip {spec.get('id')}")
+        return {
+            "id": spec.get("id"),
+            "status": "error",
+            "elapsed_s": round(time.perf_counter() - inicio, 3),
+            "error": f"{type(e).__name__}: {e}",
+        }
+
+
+def _init_worker(log_level: str) -> None:
+    # O algoritmo registra cada geração em INFO
+    logging.getLogger().setLevel(log_level)
+
+
+def run_batch(specs: list[dict], output, workers: int, telemetry_dir: str | None, log_level: str) -> int:
+    """
+    Planeja as viagens em paralelo (um processo por viagem) e grava cada
+    resultado assim que fica pronto. Retorna o número de viagens com erro.
+    """
+    erros = 0
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_worker,
+                             initargs=(log_level,)) as executor:
+        futures = {executor.submit(plan_trip, spec, telemetry_dir): spec for spec in specs}
+        for future in as_completed(futures):
+            resultado = future.result()
+            erros += resultado["status"] != "ok"
+            output.write(json.dumps(resultado, ensure_ascii=False, default=str) + "\n")
+            output.flush()
+            print(f"[{resultado['status']}] {resultado['id']} ({resultado['elapsed_s']}s)", file=sys.stderr)
+    return erros
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="Arquivo JSONL/JSON ou diretório com as especificações")
+    parser.add_argument("--output", help="Arquivo JSONL com os resultados (padrão: stdout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--matrix-provider", choices=["routes", "estimate"],
+                        help="Sobrescreve o matrix_provider de todas as viagens")
+    parser.add_argument("--telemetry-dir", help="Grava a telemetria por geração de cada viagem (JSONL)")
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--experimental", action="store_true",
+                        help="Aceita os modos de fitness experimentais (mais lentos que 'scalar'): "
+                             + ", ".join(sorted(EXPERIMENTAL_FITNESS_MODES)))
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(args.log_level)
+    specs = load_specs(args.input)
+    if not args.experimental:
+        for spec in specs:
+            fitness_mode = spec.get("ga", {}).get("fitness_mode")
+            if fitness_mode in EXPERIMENTAL_FITNESS_MODES:
+                parser.error(f"trip {spec['id']}: fitness_mode '{fitness_mode}' is experimental; pass --experimental to use it")
+    if args.matrix_provider:
+        for spec in specs:
+            spec["matrix_provider"] = args.matrix_provider
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            erros = run_batch(specs, output, args.workers, args.telemetry_dir, args.log_level)
+    else:
+        erros = run_batch(specs, sys.stdout, args.workers, args.telemetry_dir, args.log_level)
+
+    print(f"{len(specs) - erros}/{len(specs)} trips planned", file=sys.stderr)
+    return 1 if erros else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+from core.utils.geo_utils import GeoUtils
+
+# Average speed (km/h) per travel mode, using the Routes API mode names
+SPEED_PROFILES_KMH = {
+    "WALK": 4.5,
+    "BICYCLE": 15,
+    "TWO_WHEELER": 25,
+    "DRIVE": 30,
+    "TRANSIT": 20,
+}
+# Street networks are longer than the great-circle distance
+DETOUR_FACTOR = 1.3
+
+
+class EstimatedRoutesClient:
+    """
+    Offline travel matrix provider based on haversine distances.
+
+    Exposes the same interface as RoutesClient, so it can replace it for instant
+    draft plans, and is also used to fill pairs the Routes API did not return.
+    """
+
+    def __init__(self, travel_mode: str = "WALK", detour_factor: float = DETOUR_FACTOR):
+        if travel_mode not in SPEED_PROFILES_KMH:
+            raise ValueError(f"Unknown travel mode: {travel_mode}. Expected one of {list(SPEED_PROFILES_KMH)}")
+        self.travel_mode = travel_mode
+        self.speed_kmh = SPEED_PROFILES_KMH[travel_mode]
+        self.detour_factor = detour_factor
+
+    def compute_duration_and_distance(self, places_df) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Estimates duration and distance matrices from the coordinates.
+
+        :param places_df: DataFrame with places, latitude and longitude columns
+        :return: Tuple of (duration_df in minutes, distance_df in meters)
+        """
+        duration, distance = self.estimate(places_df['latitude'], places_df['longitude'])
+        names = places_df['places']
+        return (pd.DataFrame(duration, index=names, columns=names),
+                pd.DataFrame(distance, index=names, columns=names))
+
+    def update_duration_and_distance(self,
+                                     places_df: pd.DataFrame,
+                                     duration_df: pd.DataFrame,
+                                     distance_df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Same interface as RoutesClient.update_duration_and_distance; estimating
+        the whole matrix is already instant.
+        """
+        return self.compute_duration_and_distance(places_df)
+
+    def estimate(self, latitudes, longitudes) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :return: Tuple of NxN int arrays (duration in minutes, distance in meters)
+        """
+        distance_km = GeoUtils.haversine_matrix_km(latitudes, longitudes) * self.detour_factor
+        duration_minutes = np.floor(distance_km / self.speed_kmh * 60).astype(np.int64)
+        distance_meters = np.round(distance_km * 1000).astype(np.int64)
+        return duration_minutes, distance_meters
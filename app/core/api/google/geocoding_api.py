@@ -1,34 +1,184 @@
 import os
+import re
+import httpx
+import asyncio
+import logging
 import requests
+import unicodedata
+from functools import lru_cache
 from dotenv import load_dotenv
+from core.utils.rate_limiter import RateLimiter
+from core.utils.request_utils import RequestUtils
+from core.utils.persistent_cache import PersistentCache
 
 load_dotenv()
 
+# Addresses rarely move; geocoding results are cached for 30 days by default
+GEOCODE_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+# The Geocoding API allows 50 QPS per project; stay below it
+DEFAULT_REQUESTS_PER_SECOND = 40
+
 class GeoCodingClient:
     """
     A client for geocoding operations using the Google Geocoding API.
+
+    Results are cached per normalized address (case, spacing and punctuation
+    around commas do not matter) and requests go through a pooled
+    session shared by every client, rate limited to `requests_per_second`.
+    The rate limiter is shared too: the Geocoding API quota is per project,
+    not per client instance.
     """
 
-    def __init__(self):
+    def __init__(self,
+                 cache: PersistentCache | None = None,
+                 use_cache: bool = True,
+                 max_workers: int = 8,
+                 requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                 max_retries: int = 3):
         self.api_key = os.getenv("GOOGLE_MAPS_API_KEY")
         self.endpoint = "https://maps.googleapis.com/maps/api/geocode/json"
+        if use_cache and cache is None:
+            cache = PersistentCache("geocoding", GEOCODE_CACHE_TTL_SECONDS)
+        self.cache = cache if use_cache else None
+        self.max_workers = max_workers
+        self.session = self._shared_session(max_workers, max_retries)
+        self.rate_limiter = self._shared_rate_limiter(requests_per_second)
 
     def get_coordinates(self, location: str) -> tuple[float, float]:
         """
         Retrieves the latitude and longitude of a given location.
-        
+
         :param location: The name or address of the location to geocode.
         :return: A tuple (latitude, longitude)
         :raises ValueError: If location not found or API error.
         """
-        params = {
+        cached = self._get_cached(location)
+        if cached is not None:
+            return cached
+
+        self.rate_limiter.wait()
+        response = self.session.get(self.endpoint, params=self._build_params(location))
+        coordinates = self._parse_response(response.json())
+        self._store(location, coordinates)
+        return coordinates
+
+    async def get_coordinates_async(self, client: httpx.AsyncClient, location: str) -> tuple[float, float]:
+        """
+        Async version of `get_coordinates` using a shared httpx.AsyncClient.
+
+        :param client: httpx.AsyncClient (connection pool) used for the request.
+        :param location: The name or address of the location to geocode.
+        :return: A tuple (latitude, longitude)
+        :raises ValueError: If location not found or API error.
+        """
+        cached = self._get_cached(location)
+        if cached is not None:
+            return cached
+
+        await self.rate_limiter.wait_async()
+        response = await client.get(self.endpoint, params=self._build_params(location))
+        coordinates = self._parse_response(response.json())
+        self._store(location, coordinates)
+        return coordinates
+
+    def get_coordinates_batch(self, locations: list[str]) -> list[tuple[float, float] | None]:
+        """
+        Geocodes many locations concurrently (up to `max_workers` at a time,
+        within the rate limit). Duplicated addresses are requested once.
+
+        :param locations: Names or addresses to geocode.
+        :return: List aligned with `locations`; None where the location was not found.
+        """
+        found, pending = self._split_cached(locations)
+        tasks = [lambda location=location: self._get_coordinates_or_none(location) for location in pending]
+        results = RequestUtils.run_parallel_tasks(tasks, max_workers=max(1, min(self.max_workers, len(tasks))))
+        found.update(zip(map(self.normalize_address, pending), results))
+        return [found.get(self.normalize_address(location)) for location in locations]
+
+    async def get_coordinates_batch_async(self,
+                                          client: httpx.AsyncClient,
+                                          locations: list[str]) -> list[tuple[float, float] | None]:
+        """
+        Async version of `get_coordinates_batch`.
+
+        :param client: httpx.AsyncClient (connection pool) used for the requests.
+        :param locations: Names or addresses to geocode.
+        :return: List aligned with `locations`; None where the location was not found.
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def geocode(location: str) -> tuple[float, float] | None:
+            async with semaphore:
+                try:
+                    return await self.get_coordinates_async(client, location)
+                except (ValueError, httpx.HTTPError):
+                    logging.warning(f"Could not geocode {location!r}", exc_info=True)
+                    return None
+
+        found, pending = self._split_cached(locations)
+        results = await asyncio.gather(*(geocode(location) for location in pending))
+        found.update(zip(map(self.normalize_address, pending), results))
+        return [found.get(self.normalize_address(location)) for location in locations]
+
+    def _split_cached(self, locations: list[str]) -> tuple[dict[str, tuple[float, float]], list[str]]:
+        """
+        Splits `locations` into cached coordinates (by normalized address) and
+        the locations still to request, one per normalized address.
+        """
+        unique = {}
+        for location in locations:
+            unique.setdefault(self.normalize_address(location), location)
+        cached = self.cache.get_many(unique) if self.cache else {}
+        found = {key: tuple(value) for key, value in cached.items()}
+        pending = [location for key, location in unique.items() if key not in found]
+        return found, pending
+
+    def _get_coordinates_or_none(self, location: str) -> tuple[float, float] | None:
+        try:
+            return self.get_coordinates(location)
+        except (ValueError, requests.RequestException):
+            logging.warning(f"Could not geocode {location!r}", exc_info=True)
+            return None
+
+    def _get_cached(self, location: str) -> tuple[float, float] | None:
+        if self.cache is None:
+            return None
+        cached = self.cache.get(self.normalize_address(location))
+        return tuple(cached) if cached is not None else None
+
+    def _store(self, location: str, coordinates: tuple[float, float]) -> None:
+        if self.cache is not None:
+            self.cache.set(self.normalize_address(location), list(coordinates))
+
+    def _build_params(self, location: str) -> dict:
+        return {
             "address": location,
             "key": self.api_key
         }
 
-        response = requests.get(self.endpoint, params=params)
-        data = response.json()
+    @staticmethod
+    def normalize_address(location: str) -> str:
+        """
+        Normalizes an address for cache lookups: Unicode NFKC, case folded,
+        single spaces, ", " between parts and no leading/trailing punctuation.
+        """
+        address = unicodedata.normalize("NFKC", location).casefold()
+        address = re.sub(r"\s*,\s*", ", ", address)
+        address = re.sub(r"\s+", " ", address)
+        return address.strip(" ,.;")
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _shared_session(pool_size: int, max_retries: int) -> requests.Session:
+        return RequestUtils.build_session(pool_size, max_retries, allowed_methods=["GET"])
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _shared_rate_limiter(requests_per_second: float) -> RateLimiter:
+        return RateLimiter(requests_per_second)
 
+    @staticmethod
+    def _parse_response(data: dict) -> tuple[float, float]:
         if data["status"] != "OK":
             raise ValueError(f"Geocoding error: {data['status']} - {data.get('error_message', '')}")
 
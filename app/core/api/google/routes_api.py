@@ -1,91 +1,370 @@
 import os
-import requests
-import os
-import requests
+import httpx
+import asyncio
 import pandas as pd
 from dotenv import load_dotenv
+from typing import Callable, Sequence
+from core.utils.request_utils import RequestUtils, RETRY_STATUS_CODES, RETRY_BACKOFF_SECONDS
+from core.utils.persistent_cache import PersistentCache
+from core.api.estimated_routes_api import EstimatedRoutesClient
 
 load_dotenv()
 
+# Route pairs are cached for a week by default
+ROUTE_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+# 5 decimal places is roughly 1 meter
+COORDINATE_PRECISION = 5
+# computeRouteMatrix accepts at most 625 elements (origins x destinations) per request
+MAX_ELEMENTS_PER_REQUEST = 625
+# Travel modes with a lower element limit
+MAX_ELEMENTS_PER_TRAVEL_MODE = {"TRANSIT": 100}
+
+
 class RoutesClient:
     """
     A client for interacting with the Google Routes API (computeRouteMatrix).
     Accepts a DataFrame with latitude and longitude to compute pairwise travel times and distances.
+
+    Durations and distances are cached per (origin, destination, travel mode) pair,
+    so only the pairs that are not cached yet are requested from the API. Large
+    requests are split into tiles under the API element limit and fetched
+    concurrently over a pooled session that retries with backoff. Pairs the API
+    does not return, or returns without a route (condition other than
+    ROUTE_EXISTS), are not cached and are filled with haversine estimates
+    unless `fill_missing` is False.
     """
 
-    def __init__(self):
+    def __init__(self,
+                 travel_mode: str = "WALK",
+                 cache: PersistentCache | None = None,
+                 use_cache: bool = True,
+                 max_workers: int = 8,
+                 max_elements: int | None = None,
+                 max_retries: int = 3,
+                 fill_missing: bool = True):
         self.api_key = os.getenv("GOOGLE_MAPS_API_KEY")
         self.endpoint = "https://routes.googleapis.com/distanceMatrix/v2:computeRouteMatrix"
         self.base_headers = {
             "Content-Type": "application/json",
             "X-Goog-Api-Key": self.api_key,
         }
+        self.travel_mode = travel_mode
+        if use_cache and cache is None:
+            cache = PersistentCache("route_matrix", ROUTE_CACHE_TTL_SECONDS)
+        self.cache = cache if use_cache else None
+        self.max_workers = max_workers
+        # Element limit of the travel mode; `max_elements` can only lower it
+        limit = MAX_ELEMENTS_PER_TRAVEL_MODE.get(travel_mode, MAX_ELEMENTS_PER_REQUEST)
+        self.max_elements = min(max_elements, limit) if max_elements else limit
+        self.max_retries = max_retries
+        self.session = RequestUtils.build_session(max_workers, max_retries, allowed_methods=["POST"])
+        self.estimator = EstimatedRoutesClient(travel_mode) if fill_missing else None
 
     def compute_duration_and_distance(self, places_df) -> tuple[pd.DataFrame, pd.DataFrame]:
         """
         Main method to call the API and return separate duration and distance matrices.
 
         :param places_df: DataFrame with latitude and longitude columns
-        :param mode: Travel mode
         :return: Tuple of (duration_df, distance_df)
         """
         combined_matrix = self._get_travel_matrix(places_df)
         return self._split_matrix(combined_matrix)
-    
-    def _get_travel_matrix(self, places_df) -> pd.DataFrame:
+
+    def update_duration_and_distance(self,
+                                     places_df: pd.DataFrame,
+                                     duration_df: pd.DataFrame,
+                                     distance_df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
         """
-        Computes the matrix between all points in the DataFrame.
+        Updates existing matrices to match `places_df`: places no longer present are
+        dropped and only the rows and columns of new places are requested.
+
+        :param places_df: DataFrame with the current places (including HOTEL).
+        :param duration_df: Current duration matrix.
+        :param distance_df: Current distance matrix.
+        :return: Tuple of (duration_df, distance_df) indexed by `places_df['places']`.
+        """
+        names = places_df['places'].tolist()
+        position = {name: i for i, name in enumerate(names)}
+        kept = [name for name in names if name in duration_df.index and name in distance_df.index]
+
+        durations = duration_df.loc[kept, kept].to_numpy().tolist()
+        distances = distance_df.loc[kept, kept].to_numpy().tolist()
+        known = {}
+        for a, origin in enumerate(kept):
+            for b, destination in enumerate(kept):
+                duration, distance = durations[a][b], distances[a][b]
+                if not pd.isna(duration) and not pd.isna(distance):
+                    known[(position[origin], position[destination])] = (duration, distance)
+
+        combined_matrix = self._get_travel_matrix(places_df, known)
+        return self._split_matrix(combined_matrix)
+
+    def _get_travel_matrix(self, places_df, known: dict[tuple[int, int], tuple] | None = None) -> pd.DataFrame:
+        """
+        Computes the matrix between all points in the DataFrame, reusing cached pairs.
 
         :param places_df: DataFrame with 'latitude' and 'longitude' columns.
-        :param mode: Travel mode: WALK, DRIVE, BICYCLE, TRANSIT
+        :param known: Optional pairs {(i, j): (duration, distance)} already available.
         :return: DataFrame NxN with tuples (duration in minutes, distance in meters).
         """
         coordinates = list(zip(places_df['latitude'], places_df['longitude']))
-        waypoints = [
-            {
-                "waypoint": {
-                    "location": {
-                        "latLng": {
-                            "latitude": lat,
-                            "longitude": lng
-                        }
-                    }
-                }
-            }
-            for lat, lng in coordinates
-        ]
+        n = len(coordinates)
+        matrix = [[None for _ in range(n)] for _ in range(n)]
+        for (i, j), value in (known or {}).items():
+            matrix[i][j] = value
 
-        body = {
-            "origins": waypoints,
-            "destinations": waypoints,
-            "travelMode": "WALK",
+        missing_groups = self._lookup_block(coordinates, matrix, range(n), range(n))
+        for destinations, origins in missing_groups.items():
+            pairs = self._request_matrix([coordinates[i] for i in origins],
+                                         [coordinates[j] for j in destinations])
+            self._store_pairs(coordinates, matrix, origins, destinations, pairs)
+
+        if self.estimator is not None:
+            self._fill_missing_pairs(matrix, places_df['latitude'], places_df['longitude'])
+
+        return pd.DataFrame(matrix, index=places_df['places'], columns=places_df['places'])
+
+    async def fill_block_async(self,
+                               client: httpx.AsyncClient,
+                               coordinates: list[tuple[float, float]],
+                               matrix: list[list],
+                               origins: Sequence[int],
+                               destinations: Sequence[int],
+                               semaphore: asyncio.Semaphore,
+                               on_tile: Callable[[int, int], None] | None = None) -> None:
+        """
+        Async counterpart of the matrix fetch for one block of the matrix: fills
+        `matrix[i][j]` for i in `origins` and j in `destinations`, reusing cached
+        pairs and requesting the missing tiles concurrently.
+
+        :param client: Shared httpx.AsyncClient (connection pool).
+        :param coordinates: (latitude, longitude) of every place, indexed like `matrix`.
+        :param matrix: NxN list of lists updated in place.
+        :param semaphore: Bounds the number of requests in flight.
+        :param on_tile: Optional callback called with (origins, destinations) counts of each tile fetched.
+        """
+        missing_groups = self._lookup_block(coordinates, matrix, origins, destinations)
+        tasks = []
+        for group_destinations, group_origins in missing_groups.items():
+            for rows, cols in self._build_tiles(len(group_origins), len(group_destinations)):
+                tile_origins = [group_origins[r] for r in rows]
+                tile_destinations = [group_destinations[c] for c in cols]
+                tasks.append(self._fetch_tile_async(client, coordinates, matrix, tile_origins,
+                                                    tile_destinations, semaphore, on_tile))
+        await asyncio.gather(*tasks)
+
+    async def _fetch_tile_async(self,
+                                client: httpx.AsyncClient,
+                                coordinates: list[tuple[float, float]],
+                                matrix: list[list],
+                                origins: list[int],
+                                destinations: list[int],
+                                semaphore: asyncio.Semaphore,
+                                on_tile: Callable[[int, int], None] | None) -> None:
+        async with semaphore:
+            pairs = await self._request_tile_async(client,
+                                                   [coordinates[i] for i in origins],
+                                                   [coordinates[j] for j in destinations])
+        self._store_pairs(coordinates, matrix, origins, destinations, pairs)
+        if on_tile is not None:
+            on_tile(len(origins), len(destinations))
+
+    def _lookup_block(self,
+                      coordinates: list[tuple[float, float]],
+                      matrix: list[list],
+                      origins: Sequence[int],
+                      destinations: Sequence[int]) -> dict[tuple[int, ...], list[int]]:
+        """
+        Fills the block origins x destinations of `matrix` with cached pairs and
+        groups the missing ones: origins with the same set of missing destinations
+        share one request.
+
+        :return: Dict {missing destinations: origins}.
+        """
+        keys = {
+            (i, j): self._pair_key(coordinates[i], coordinates[j])
+            for i in origins for j in destinations if matrix[i][j] is None
         }
+        cached = self.cache.get_many(keys.values()) if self.cache and keys else {}
 
-        # Always request both fields
-        field_mask = ["originIndex", "destinationIndex", "duration", "distanceMeters"]
+        missing_groups = {}
+        for i in origins:
+            missing = []
+            for j in destinations:
+                if matrix[i][j] is not None:
+                    continue
+                value = cached.get(keys[(i, j)])
+                if value is None:
+                    missing.append(j)
+                else:
+                    matrix[i][j] = tuple(value)
+            if missing:
+                missing_groups.setdefault(tuple(missing), []).append(i)
+        return missing_groups
 
-        headers = self.base_headers.copy()
-        headers["X-Goog-FieldMask"] = ",".join(field_mask)
+    def _store_pairs(self,
+                     coordinates: list[tuple[float, float]],
+                     matrix: list[list],
+                     origins: Sequence[int],
+                     destinations: Sequence[int],
+                     pairs: dict[tuple[int, int], tuple[int, int] | None]) -> None:
+        """
+        Writes fetched pairs (indexed by position in `origins` / `destinations`) to `matrix` and to the cache.
+        Pairs without a route (None) are left missing.
+        """
+        fetched = {}
+        for (oi, dj), value in pairs.items():
+            if value is None:
+                continue
+            i, j = origins[oi], destinations[dj]
+            matrix[i][j] = value
+            fetched[self._pair_key(coordinates[i], coordinates[j])] = list(value)
+
+        if self.cache and fetched:
+            self.cache.set_many(fetched)
+
+    def _fill_missing_pairs(self, matrix: list[list], latitudes, longitudes) -> None:
+        """
+        Fills pairs left as None (not returned by the API) with estimates. Estimates are not cached.
+        """
+        if all(value is not None for row in matrix for value in row):
+            return
+        durations, distances = self.estimator.estimate(latitudes, longitudes)
+        for i, row in enumerate(matrix):
+            for j, value in enumerate(row):
+                if value is None:
+                    row[j] = (int(durations[i, j]), int(distances[i, j]))
+
+    def _request_matrix(self,
+                        origins: list[tuple[float, float]],
+                        destinations: list[tuple[float, float]]) -> dict[tuple[int, int], tuple[int, int] | None]:
+        """
+        Fetches an origins x destinations matrix, split into tiles of at most
+        `max_elements` elements that are requested concurrently.
+
+        :param origins: List of (latitude, longitude) origins.
+        :param destinations: List of (latitude, longitude) destinations.
+        :return: Dict {(origin index, destination index): (duration in minutes, distance in meters)}.
+        """
+        tiles = self._build_tiles(len(origins), len(destinations))
+        tasks = [
+            lambda rows=rows, cols=cols: self._request_tile([origins[i] for i in rows],
+                                                            [destinations[j] for j in cols])
+            for rows, cols in tiles
+        ]
+        results = RequestUtils.run_parallel_tasks(tasks, max_workers=min(self.max_workers, len(tasks)) or 1)
+
+        pairs = {}
+        for (rows, cols), tile in zip(tiles, results):
+            for (i, j), value in tile.items():
+                pairs[(rows.start + i, cols.start + j)] = value
+        return pairs
 
-        response = requests.post(self.endpoint, headers=headers, json=body)
+    def _build_tiles(self, n_origins: int, n_destinations: int) -> list[tuple[range, range]]:
+        """
+        Splits the matrix into (origin rows, destination columns) tiles whose
+        element count stays under `max_elements`.
+        """
+        if n_origins == 0 or n_destinations == 0:
+            return []
+        cols = min(n_destinations, self.max_elements)
+        rows = max(1, self.max_elements // cols)
+        return [
+            (range(i, min(i + rows, n_origins)), range(j, min(j + cols, n_destinations)))
+            for i in range(0, n_origins, rows)
+            for j in range(0, n_destinations, cols)
+        ]
+
+    def _request_tile(self,
+                      origins: list[tuple[float, float]],
+                      destinations: list[tuple[float, float]]) -> dict[tuple[int, int], tuple[int, int] | None]:
+        """
+        Sends one computeRouteMatrix request.
+
+        :param origins: List of (latitude, longitude) origins.
+        :param destinations: List of (latitude, longitude) destinations.
+        :return: Dict {(origin index, destination index): (duration in minutes, distance in meters)}.
+        """
+        headers, body = self._build_request(origins, destinations)
+        response = self.session.post(self.endpoint, headers=headers, json=body)
 
         if response.status_code != 200:
             raise ValueError(f"HTTP error {response.status_code}: {response.text}")
 
-        data = response.json()
-        n = len(places_df)
-        matrix = [[None for _ in range(n)] for _ in range(n)]
+        return self._parse_elements(response.json())
 
+    async def _request_tile_async(self,
+                                  client: httpx.AsyncClient,
+                                  origins: list[tuple[float, float]],
+                                  destinations: list[tuple[float, float]]) -> dict[tuple[int, int], tuple[int, int] | None]:
+        """
+        Async version of `_request_tile`, retrying 429/5xx responses with exponential backoff.
+        """
+        headers, body = self._build_request(origins, destinations)
+        for attempt in range(self.max_retries + 1):
+            response = await client.post(self.endpoint, headers=headers, json=body)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                break
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
+
+        if response.status_code != 200:
+            raise ValueError(f"HTTP error {response.status_code}: {response.text}")
+
+        return self._parse_elements(response.json())
+
+    def _build_request(self,
+                       origins: list[tuple[float, float]],
+                       destinations: list[tuple[float, float]]) -> tuple[dict, dict]:
+        body = {
+            "origins": [self._waypoint(lat, lng) for lat, lng in origins],
+            "destinations": [self._waypoint(lat, lng) for lat, lng in destinations],
+            "travelMode": self.travel_mode,
+        }
+
+        # Always request both fields; `condition` tells whether a route was found
+        field_mask = ["originIndex", "destinationIndex", "duration", "distanceMeters", "condition"]
+
+        headers = self.base_headers.copy()
+        headers["X-Goog-FieldMask"] = ",".join(field_mask)
+        return headers, body
+
+    @staticmethod
+    def _parse_elements(data: list[dict]) -> dict[tuple[int, int], tuple[int, int] | None]:
+        """
+        :return: Dict {(origin index, destination index): (duration in minutes, distance in meters)},
+                 with None for elements without a route (e.g. ROUTE_NOT_FOUND).
+        """
+        pairs = {}
         for item in data:
             i = item["originIndex"]
             j = item["destinationIndex"]
+            if item.get("condition") != "ROUTE_EXISTS":
+                pairs[(i, j)] = None
+                continue
             raw_duration = item.get("duration", "0s")
             duration_seconds = int(raw_duration.rstrip("s")) if isinstance(raw_duration, str) else 0
             duration_minutes = duration_seconds // 60
             distance = item.get("distanceMeters", 0)
-            matrix[i][j] = (duration_minutes, distance)
+            pairs[(i, j)] = (duration_minutes, distance)
+        return pairs
 
-        return pd.DataFrame(matrix, index=places_df['places'], columns=places_df['places'])
+    @staticmethod
+    def _waypoint(lat: float, lng: float) -> dict:
+        return {
+            "waypoint": {
+                "location": {
+                    "latLng": {
+                        "latitude": lat,
+                        "longitude": lng
+                    }
+                }
+            }
+        }
+
+    def _pair_key(self, origin: tuple[float, float], destination: tuple[float, float]) -> str:
+        (lat1, lng1), (lat2, lng2) = origin, destination
+        p = COORDINATE_PRECISION
+        return f"{self.travel_mode}:{lat1:.{p}f},{lng1:.{p}f}:{lat2:.{p}f},{lng2:.{p}f}"
 
     def _split_matrix(self, matrix_df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
         """
@@ -98,4 +377,4 @@ class RoutesClient:
         duration_df.head()
         distance_df = matrix_df.applymap(lambda x: x[1] if isinstance(x, tuple) else None)
         distance_df.head()
-        return duration_df, distance_df
\ No newline at end of file
+        return duration_df, distance_df
@@ -1,45 +1,131 @@
 import os
+import json
 import pandas as pd
-from openai import OpenAI
+from typing import AsyncIterator
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
 from core.utils.file_utils import FileUtils
+from core.utils.persistent_cache import PersistentCache
 from core.prompt.tourist_places import SYSTEM_INSTRUCTIONS
 
 
 load_dotenv()
 
+# Sugestões para o mesmo destino e duração são reaproveitadas por uma semana
+PLACES_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
 class OpenAi:
+    """
+    Sugere pontos turísticos (CSV) pela API de chat da OpenAI.
+
+    As respostas ficam em cache por (modelo, destino, dias, temperature, top_p).
+    Com `use_cache=None` o cache só é usado quando temperature == 0, já que com
+    amostragem cada chamada deveria trazer sugestões diferentes; True ou False
+    forçam o comportamento.
+    """
+
     def __init__(self,
                  top_p:float,
                  temperature: float,
                  place_name:str,
-                 trip_days:int,):
+                 trip_days:int,
+                 cache: PersistentCache | None = None,
+                 use_cache: bool | None = None):
         self.top_p = top_p
         self.temperature = temperature
         self.place_name = place_name
         self.trip_days = trip_days
         self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         self.model="gpt-4o"
         self.file_utils = FileUtils()
+        if use_cache is None:
+            use_cache = temperature == 0
+        if use_cache and cache is None:
+            cache = PersistentCache("openai_places", PLACES_CACHE_TTL_SECONDS)
+        self.cache = cache if use_cache else None
         
     def get_places_tourist_points(self) -> pd.DataFrame:
-        resposta = self.client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": self._get_system_instructions()
-                },
-                {
-                    "role": "user",
-                    "content": f"Estou planejando uma viagem de {self.trip_days} dias para {self.place_name}. Por favor, siga as instruções do sistema e retorne o número adequado de pontos turísticos."
-                }
-            ],
+        open_ai_response = self._get_cached_response()
+        if open_ai_response is None:
+            resposta = self.client.chat.completions.create(
+                messages=self._get_messages(),
+                model=self.model,
+                temperature=self.temperature,
+                top_p=self.top_p,
+            )
+            open_ai_response =  resposta.choices[0].message.content
+            self._store_response(open_ai_response)
+        return self.file_utils.from_string(open_ai_response)
+
+    async def get_places_tourist_points_async(self) -> pd.DataFrame:
+        open_ai_response = self._get_cached_response()
+        if open_ai_response is None:
+            resposta = await self.async_client.chat.completions.create(
+                messages=self._get_messages(),
+                model=self.model,
+                temperature=self.temperature,
+                top_p=self.top_p,
+            )
+            open_ai_response = resposta.choices[0].message.content
+            self._store_response(open_ai_response)
+        return self.file_utils.from_string(open_ai_response)
+
+    async def stream_places_tourist_points_async(self) -> AsyncIterator[pd.DataFrame]:
+        """
+        Versão em streaming: entrega um DataFrame a cada linha completa do CSV,
+        conforme a resposta chega, para que geocodificação e matriz comecem
+        pelos primeiros locais. Com a resposta em cache, entrega tudo de uma vez.
+        """
+        open_ai_response = self._get_cached_response()
+        if open_ai_response is not None:
+            yield self.file_utils.from_string(open_ai_response)
+            return
+
+        stream = await self.async_client.chat.completions.create(
+            messages=self._get_messages(),
             model=self.model,
             temperature=self.temperature,
             top_p=self.top_p,
+            stream=True,
         )
-        open_ai_response =  resposta.choices[0].message.content
-        return self.file_utils.from_string(open_ai_response)
+        parser = CsvRowParser()
+        chunks = []
+        async for chunk in stream:
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            content = chunk.choices[0].delta.content
+            chunks.append(content)
+            rows = parser.feed(content)
+            if rows:
+                yield self.file_utils.from_string(parser.to_csv(rows))
+
+        rows = parser.close()
+        if rows:
+            yield self.file_utils.from_string(parser.to_csv(rows))
+        self._store_response("".join(chunks))
+
+    def _cache_key(self) -> str:
+        return json.dumps([self.model, self.place_name, self.trip_days, self.temperature, self.top_p])
+
+    def _get_cached_response(self) -> str | None:
+        return self.cache.get(self._cache_key()) if self.cache else None
+
+    def _store_response(self, open_ai_response: str) -> None:
+        if self.cache:
+            self.cache.set(self._cache_key(), open_ai_response)
+
+    def _get_messages(self) -> list[dict]:
+        return [
+            {
+                "role": "system",
+                "content": self._get_system_instructions()
+            },
+            {
+                "role": "user",
+                "content": f"Estou planejando uma viagem de {self.trip_days} dias para {self.place_name}. Por favor, siga as instruções do sistema e retorne o número adequado de pontos turísticos."
+            }
+        ]
     
     def _get_system_instructions(self) -> str:
         """
@@ -56,4 +142,54 @@ class OpenAi:
         return SYSTEM_INSTRUCTIONS.format(
             quantidade_dias_viagem=self.trip_days,
             quantidade_total_pontos=total_pontos
-        )
\ No newline at end of file
+        )
+
+
+class CsvRowParser:
+    """
+    Separa um CSV recebido em pedaços em linhas completas. A primeira linha é o
+    cabeçalho; uma linha só é entregue quando termina fora de aspas, então
+    campos entre aspas com vírgulas ou quebras de linha são preservados.
+    """
+
+    def __init__(self):
+        self.header = None
+        self._buffer = ""
+
+    def feed(self, text: str) -> list[str]:
+        """
+        Adiciona `text` ao buffer e retorna as linhas de dados completas.
+        """
+        self._buffer += text
+        rows = []
+        start = 0
+        in_quotes = False
+        for i, char in enumerate(self._buffer):
+            if char == '"':
+                in_quotes = not in_quotes
+            elif char == "\n" and not in_quotes:
+                self._add_line(self._buffer[start:i], rows)
+                start = i + 1
+        self._buffer = self._buffer[start:]
+        return rows
+
+    def close(self) -> list[str]:
+        """
+        Retorna a última linha, caso a resposta não termine com quebra de linha.
+        """
+        rows = []
+        self._add_line(self._buffer, rows)
+        self._buffer = ""
+        return rows
+
+    def to_csv(self, rows: list[str]) -> str:
+        return "\n".join([self.header, *rows])
+
+    def _add_line(self, line: str, rows: list[str]) -> None:
+        line = line.strip()
+        if not line:
+            return
+        if self.header is None:
+            self.header = line
+        else:
+            rows.append(line)
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from core.utils.date_utils import DateUtils
+from core.utils.time_utils import TimeUtils
+
+# Preenche os intervalos não usados de um dia (e os dias fechados: "Closed", vazio, etc.)
+CLOSED = -1
+
+
+class CompiledProblem:
+    """
+    Representação compilada do problema, construída uma única vez por execução.
+
+    Todos os dados consultados pela função de fitness ficam em arrays NumPy
+    indexados pela posição do local em `places` (a mesma usada por `iloc`):
+
+    - travel[i, j]: deslocamento do local i até o local j (minutos)
+    - hotel_travel[j]: deslocamento do HOTEL até o local j
+    - visit_duration[j]: duração estimada da visita
+    - is_priority[j]: local prioritário (priority == 1)
+    - opening_start / opening_end[j, d, m]: m-ésimo intervalo de
+      funcionamento (int16, minutos) do local j no d-ésimo dia do roteiro, ou
+      CLOSED. Dias com um único intervalo ocupam só m = 0.
+    - trip_weekday[d]: dia da semana (índice em `weekday_keys`) do d-ésimo dia do roteiro
+
+    Os horários são lidos uma única vez aqui (cada texto distinto é
+    interpretado uma vez); a fitness só compara inteiros.
+    """
+
+    def __init__(self,
+                 places: pd.DataFrame,
+                 duration: pd.DataFrame,
+                 start_date: datetime,
+                 end_date: datetime):
+        self.size = len(places)
+        names = places['places'].tolist()
+
+        self.travel = self._to_array(duration.loc[names, names])
+        self.hotel_travel = self._to_array(duration.loc['HOTEL', names])
+        self.visit_duration = self._to_array(places['estimated_duration_min'])
+
+        if 'priority' in places.columns:
+            self.is_priority = (places['priority'] == 1).to_numpy()
+        else:
+            self.is_priority = np.zeros(self.size, dtype=bool)
+
+        dias_roteiro = DateUtils.get_date_range(start_date, end_date)
+        dias_da_semana = [DateUtils.get_day_abbr(d).lower() for d in dias_roteiro]
+        self.weekday_keys = list(dict.fromkeys(dias_da_semana))
+        self.trip_weekday = np.array([self.weekday_keys.index(d) for d in dias_da_semana], dtype=np.int64)
+        self.trip_days = len(dias_da_semana)
+
+        self.opening_start, self.opening_end = self._compile_opening_hours(places)
+
+        # Visões em listas Python para o laço escalar: indexar listas é bem
+        # mais barato que indexar escalares NumPy um a um.
+        self.travel_rows = self.travel.tolist()
+        self.hotel_travel_list = self.hotel_travel.tolist()
+        self.visit_duration_list = self.visit_duration.tolist()
+        self.is_priority_list = self.is_priority.tolist()
+        # opening_rows[j][d]: tupla de intervalos (início, fim); vazia se fechado
+        self.opening_rows = [
+            [tuple((s, e) for s, e in zip(inicios, fins) if s != CLOSED)
+             for inicios, fins in zip(dias_inicio, dias_fim)]
+            for dias_inicio, dias_fim in zip(self.opening_start.tolist(), self.opening_end.tolist())
+        ]
+
+    def _compile_opening_hours(self, places: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        intervalos_por_texto = {}
+        intervalos = [[[] for _ in self.weekday_keys] for _ in range(self.size)]
+        for k, dia in enumerate(self.weekday_keys):
+            if dia not in places.columns:
+                continue
+            for j, horario in enumerate(places[dia].tolist()):
+                chave = horario if isinstance(horario, str) else None
+                if chave not in intervalos_por_texto:
+                    intervalos_por_texto[chave] = TimeUtils.parse_opening_hours(chave)
+                intervalos[j][k] = intervalos_por_texto[chave]
+
+        maximo = max((len(dia) for local in intervalos for dia in local), default=0)
+        shape = (self.size, len(self.weekday_keys), max(maximo, 1))
+        semana_inicio = np.full(shape, CLOSED, dtype=np.int16)
+        semana_fim = np.full(shape, CLOSED, dtype=np.int16)
+        for j, local in enumerate(intervalos):
+            for k, dia in enumerate(local):
+                for m, (inicio, fim) in enumerate(dia):
+                    semana_inicio[j, k, m] = inicio
+                    semana_fim[j, k, m] = fim
+
+        # Expande da semana para os dias do roteiro
+        return semana_inicio[:, self.trip_weekday, :], semana_fim[:, self.trip_weekday, :]
+
+    @staticmethod
+    def _to_array(values: pd.DataFrame | pd.Series) -> np.ndarray:
+        array = values.to_numpy()
+        # Matrizes com pares ausentes (None) chegam como object
+        if array.dtype == object:
+            array = array.astype(float)
+        return array
@@ -1,14 +1,58 @@
+import time
 import random
+import threading
 import logging
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from core.utils.date_utils import DateUtils
 from core.utils.geo_utils import GeoUtils
 from core.utils.time_utils import TimeUtils
+from core.utils.lru_cache import LRUCache
+from core.genetic.compiled_problem import CompiledProblem
+from core.genetic.local_search import LocalSearch
+from core.genetic.crossover import CROSSOVER_OPERATORS
+from core.genetic.population import PopulationBuffers
+from core.genetic.seeding import seed_individuals
+from core.genetic.telemetry import GenerationTelemetry, GenerationObserver
+from core.genetic.fitness import (FitnessEvaluator, BatchFitnessEvaluator, IncrementalFitnessEvaluator,
+                                  SegmentFitnessEvaluator)
 
 # logging configuration
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Modos de avaliação de fitness: "scalar" avalia indivíduo a indivíduo (o
+# mais rápido nos tamanhos usuais), "batch" avalia a população inteira de
+# forma vetorizada (só compensa com populações grandes), "incremental"
+# retoma a simulação dos filhos a partir do estado dos pais e "segment"
+# reaproveita a avaliação de dias (sub-rotas) já vistos
+FITNESS_EVALUATORS = {
+    "scalar": FitnessEvaluator,
+    "batch": BatchFitnessEvaluator,
+    "incremental": IncrementalFitnessEvaluator,
+    "segment": SegmentFitnessEvaluator,
+}
+# Modos experimentais: corretos, mas mais lentos que "scalar" nos tamanhos
+# usuais; ficam fora da interface e a CLI só os aceita com --experimental
+EXPERIMENTAL_FITNESS_MODES = {"incremental", "segment"}
+
+# Fração do orçamento da busca local reservada para o melhor indivíduo final
+LOCAL_SEARCH_FINAL_SHARE = 0.25
+# Fração do orçamento de tempo da execução disponível para a semeadura heurística
+SEEDING_BUDGET_SHARE = 0.25
+
+# Gerações sem melhoria até a parada (modo fixo)
+STAGNATION_LIMIT = 5
+# Modo adaptativo: o limite de estagnação parte de ~sqrt(número de locais),
+# dentro destes extremos, e é escalado pela diversidade da população
+ADAPTIVE_STAGNATION_MIN = 3
+ADAPTIVE_STAGNATION_MAX = 40
+# Diversidade (fração de genes diferentes do melhor indivíduo) abaixo da qual a
+# população é considerada convergida: a mutação sobe até ADAPTIVE_MUTATION_MAX
+# e o crossover cai até a metade da taxa configurada
+TARGET_DIVERSITY = 0.25
+ADAPTIVE_MUTATION_MAX = 0.5
+
 class TravelGeneticAlgorithm:
     def __init__(self,
                  places: pd.DataFrame,
@@ -20,7 +64,19 @@ class TravelGeneticAlgorithm:
                  crossover_rate: int,
                  time_min_daily:int,
                  start_date: datetime,
-                 end_date: datetime,):
+                 end_date: datetime,
+                 fitness_mode: str = "scalar",
+                 fitness_cache_size: int = 10_000,
+                 local_search_budget_ms: int = 0,
+                 observers: list[GenerationObserver] | None = None,
+                 crossover_operator: str = "ox",
+                 initial_population: np.ndarray | list[list[int]] | None = None,
+                 stop_event: threading.Event | None = None,
+                 time_budget_ms: int = 0,
+                 adaptive: bool = False,
+                 seed_ratio: float = 0.0,):
+        # Os genes são posições em `places` (as mesmas dos arrays de CompiledProblem e de `iloc`)
+        places = places.reset_index(drop=True)
         self.places = places
         self.duration = duration
         self.distance = distance
@@ -28,69 +84,296 @@ class TravelGeneticAlgorithm:
         self.generations = generations
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
+        # Taxas configuradas; no modo adaptativo as taxas atuais variam a partir delas
+        self.base_mutation_rate = mutation_rate
+        self.base_crossover_rate = crossover_rate
+        # Modo anytime: orçamento de tempo de parede por execução (0 = sem limite);
+        # `generations` passa a ser apenas o máximo de gerações
+        self.time_budget_ms = time_budget_ms
+        # Limite de estagnação pela diversidade e taxas de mutação/crossover adaptativas
+        self.adaptive = adaptive
         self.time_min_daily = time_min_daily
         self.start_date = start_date
         self.end_date = end_date
         self.population = pd.DataFrame()
+        # Indivíduos de uma execução anterior (warm start); o restante é aleatório
+        self.initial_population = initial_population
+        self.warm_start_size = 0
+        # Fração da população inicial construída por heurísticas (vizinho mais
+        # próximo, inserção mais barata, prioritários primeiro); o restante é aleatório
+        self.seed_ratio = seed_ratio
+        self.seeded_size = 0
+        # Sinal para interromper a execução ao fim da geração atual (cancelar ou aceitar o melhor atual)
+        self.stop_event = stop_event
+        # População atual e próxima em matrizes pré-alocadas (double buffering)
+        self.buffers = PopulationBuffers(population_size, len(places), int(places.index.max()) if len(places) else 0)
+        # Índices, na população anterior, dos pais de cada indivíduo da população
+        # atual (usado pela avaliação incremental)
+        self.lineage = None
         self.geo_utils = GeoUtils()
         self.time_utils = TimeUtils()
         self.date_utils = DateUtils()
+        # Dados do problema compilados em arrays, consultados pela função de fitness
+        self.problem = CompiledProblem(places, duration, start_date, end_date)
+        self.fitness_mode = fitness_mode
+        if crossover_operator not in CROSSOVER_OPERATORS:
+            raise ValueError(f"Invalid crossover operator: {crossover_operator}. Expected one of {list(CROSSOVER_OPERATORS)}")
+        self.crossover_operator = crossover_operator
+        self.crossover = CROSSOVER_OPERATORS[crossover_operator]
+        self.evaluator = self._build_evaluator(fitness_mode)
+        # Cache LRU de fitness por permutação: elite e clones não são reavaliados
+        self.fitness_cache = LRUCache(fitness_cache_size) if fitness_cache_size > 0 else None
+        # Estágio memético (2-opt / Or-opt) limitado por um orçamento em ms por execução
+        self.local_search_budget_ms = local_search_budget_ms
+        self.local_search = LocalSearch(self.problem, self._evaluate_individual)
+        self._local_search_spent = 0.0
+        # Instante (no relógio da execução) da primeira geração, após a população inicial
+        self._generations_start = 0.0
+        # Tempos por fase e estatísticas de cada geração, entregues aos observadores
+        self.telemetry = GenerationTelemetry(observers)
+
+    def add_observer(self, observer: GenerationObserver) -> None:
+        """
+        Registra um observador (GenerationObserver ou função que recebe as
+        estatísticas de cada geração).
+        """
+        self.telemetry.add_observer(observer)
 
     def run(self) -> dict:
+        self.mutation_rate = self.base_mutation_rate
+        self.crossover_rate = self.base_crossover_rate
+        # O relógio (e o orçamento de tempo) inclui a população inicial e a semeadura
+        self.telemetry.start_run(self._run_info(), self._telemetry_counters())
+
         self.population = self._initialize_population()
+        self._generations_start = self.telemetry.elapsed()
+        self.lineage = None
+        self._local_search_spent = 0.0
 
         best_fitness = float('-inf')
         best_individual = None
+        best_generation = 0
+        time_to_best = 0.0
         generations_without_improvement = 0
-        max_generations_without_improvement = 5
 
         for generation in range(self.generations):
-            fitness_scores, roteiro_por_dia = self._evaluate_fitness()
+            with self.telemetry.phase("evaluation"):
+                fitness_scores, roteiro_por_dia = self._evaluate_fitness()
+            if self.local_search_budget_ms > 0:
+                with self.telemetry.phase("local_search"):
+                    self._apply_local_search(fitness_scores, roteiro_por_dia, generation)
             current_best = max(fitness_scores)
             best_idx = fitness_scores.index(current_best)
 
             if current_best > best_fitness:
                 best_fitness = current_best
-                best_individual = self.population[best_idx]
+                best_individual = self.population[best_idx].tolist()
                 best_roteiro = roteiro_por_dia[best_idx]
+                best_generation = generation
+                time_to_best = self.telemetry.elapsed()
                 generations_without_improvement = 0
                 logging.info(f"Generation {generation}: New best fitness found: {best_fitness:.2f}")
+                self._notify_new_best(generation, best_fitness, best_individual, best_roteiro)
             else:
                 generations_without_improvement += 1
 
-            elite, fathers = self._select_parents_by_elistism_tournament(
-                fitness_scores,
-                elitismo=2,
-                k_torneio=3,
-            )
-            children = self._apply_crossover_ox(fathers)
-            mutated_children = self._apply_mutation(children)
+            diversidade = self._diversity(self.population, best_idx)
+            self._adapt_rates(diversidade)
+            adaptacao = self._adaptive_stats(diversidade)
 
-            self.population = elite + mutated_children[:self.population_size - len(elite)]
+            avaliada = self.population
+            self.population = self._next_generation(fitness_scores)
+            self.telemetry.end_generation(generation, fitness_scores, avaliada, self._telemetry_counters(), adaptacao)
 
             logging.info(f"Generation {generation} | Best fitness: {current_best:.2f}")
             generation_reached = generation + 1
 
-            if generations_without_improvement >= max_generations_without_improvement:
+            if generations_without_improvement >= self._stagnation_limit(diversidade):
                 logging.info(f"Parada antecipada por estagnação após {generation + 1} gerações.")
                 break
 
+            if self.stopped:
+                logging.info(f"Execução interrompida após {generation + 1} gerações.")
+                break
+
+            if self._out_of_time(generation_reached):
+                logging.info(f"Orçamento de tempo esgotado após {generation + 1} gerações.")
+                break
+
+        if self.local_search_budget_ms > 0 and not self.stopped:
+            with self.telemetry.phase("local_search"):
+                polido = self._polish_best(best_individual, best_fitness, best_roteiro)
+            if polido[1] > best_fitness:
+                time_to_best = self.telemetry.elapsed()
+            best_individual, best_fitness, best_roteiro = polido
+        self.telemetry.end_run({"best_fitness": float(best_fitness), "generations": generation_reached})
+        timing = self._timing_stats(time_to_best, best_generation)
+
         logging.info(f"Algoritmo finalizado após {generation_reached} gerações.")
         logging.info(f"Melhor fitness final: {best_fitness:.2f}")
         logging.info("Melhor indivíduo (ordem dos locais):", best_individual)
         logging.info("Melhor roteiro por dia:")
 
+        resposta = self._build_response(best_fitness, generation_reached, best_individual, best_roteiro, timing=timing)
+        if isinstance(self.evaluator, SegmentFitnessEvaluator):
+            resposta["cache_segmentos"] = self.evaluator.segmentos.stats()
+        return resposta
+
+    def _next_generation(self, fitness_scores: list[float]) -> np.ndarray:
+        """
+        Escreve a próxima geração (elite seguida dos filhos) na matriz livre e
+        a torna a população atual.
+        """
+        atual = self.buffers.current
+        proxima = self.buffers.next
+        with self.telemetry.phase("selection"):
+            elite, fathers = self._select_parents_by_elistism_tournament(
+                fitness_scores,
+                elitismo=2,
+                k_torneio=3,
+            )
+            np.take(atual, elite, axis=0, out=proxima[:len(elite)])
+        filhos = proxima[len(elite):]
+        with self.telemetry.phase("crossover"):
+            self._apply_crossover(atual, fathers, filhos)
+        with self.telemetry.phase("mutation"):
+            self._apply_mutation(filhos)
+
+        # Cada filho vem do par de pais (i, i ^ 1); a elite é mantida sem alterações
+        self.lineage = [(individuo,) for individuo in elite] + [
+            (fathers[i], fathers[i ^ 1]) if (i ^ 1) < len(fathers) else (fathers[i],)
+            for i in range(len(filhos))
+        ]
+
+        return self.buffers.swap()
+
+    @staticmethod
+    def _diversity(population: np.ndarray, best_idx: int) -> float:
+        """
+        Fração dos genes da população diferentes, posição a posição, dos genes
+        do melhor indivíduo (0 = população convergida).
+        """
+        if len(population) < 2:
+            return 0.0
+        return float((population != population[best_idx]).mean())
+
+    def _stagnation_limit(self, diversidade: float) -> int:
+        """
+        Gerações sem melhoria toleradas. No modo adaptativo, instâncias maiores
+        e populações ainda diversas (explorando) toleram mais gerações.
+        """
+        if not self.adaptive:
+            return STAGNATION_LIMIT
+        base = min(ADAPTIVE_STAGNATION_MAX, max(ADAPTIVE_STAGNATION_MIN, round(self.problem.size ** 0.5)))
+        return max(ADAPTIVE_STAGNATION_MIN, round(base * (0.5 + diversidade)))
+
+    def _adapt_rates(self, diversidade: float) -> None:
+        """
+        Modo adaptativo: quanto mais a diversidade fica abaixo de
+        TARGET_DIVERSITY, maior a mutação (exploração) e menor o crossover.
+        """
+        if not self.adaptive:
+            return
+        falta = max(0.0, 1 - diversidade / TARGET_DIVERSITY)
+        mutacao_maxima = max(ADAPTIVE_MUTATION_MAX, self.base_mutation_rate)
+        self.mutation_rate = self.base_mutation_rate + (mutacao_maxima - self.base_mutation_rate) * falta
+        self.crossover_rate = self.base_crossover_rate * (1 - 0.5 * falta)
+
+    def _adaptive_stats(self, diversidade: float) -> dict:
+        return {
+            "diversity": round(diversidade, 4),
+            "mutation_rate": round(self.mutation_rate, 4),
+            "crossover_rate": round(self.crossover_rate, 4),
+        }
+
+    def _out_of_time(self, generations_done: int, next_generations: int = 1) -> bool:
+        """
+        Modo anytime: verdadeiro se as próximas `next_generations` gerações,
+        no tempo médio das anteriores, estourariam o orçamento. O orçamento
+        conta desde o início da execução, incluindo a população inicial.
+        """
+        if self.time_budget_ms <= 0 or generations_done <= 0:
+            return False
+        decorrido = self.telemetry.elapsed()
+        media = (decorrido - self._generations_start) / generations_done
+        return decorrido + media * next_generations > self.time_budget_ms / 1000
+
+    def _timing_stats(self, time_to_best: float, best_generation: int) -> dict:
+        return {
+            "tempo_ate_melhor_s": round(time_to_best, 4),
+            "geracao_do_melhor": best_generation,
+            "tempo_total_s": round(self.telemetry.elapsed(), 4),
+        }
+
+    @property
+    def stopped(self) -> bool:
+        return self.stop_event is not None and self.stop_event.is_set()
+
+    def _notify_new_best(self,
+                         generation: int,
+                         best_fitness: float,
+                         best_individual: list[int],
+                         best_roteiro: list[list[int]]) -> None:
+        if not self.telemetry.observers:
+            return
+        self.telemetry.new_best({
+            "generation": generation,
+            "melhor_fitness": round(float(best_fitness), 4),
+            "melhor_individuo_idx": list(best_individual),
+            "roteiro_por_dia": self._format_roteiro_por_dia(best_roteiro, log=False),
+        })
+
+    def _run_info(self) -> dict:
+        return {
+            "places": self.problem.size,
+            "trip_days": self.problem.trip_days,
+            "population_size": self.population_size,
+            "generations": self.generations,
+            "mutation_rate": self.mutation_rate,
+            "crossover_rate": self.crossover_rate,
+            "crossover_operator": self.crossover_operator,
+            "fitness_mode": self.fitness_mode,
+            "time_budget_ms": self.time_budget_ms,
+            "adaptive": self.adaptive,
+            "seed_ratio": self.seed_ratio,
+        }
+
+    def _telemetry_counters(self) -> dict[str, tuple[int, int]]:
+        """
+        Contadores acumulados (acertos, falhas) dos caches, para a taxa de acerto por geração.
+        """
+        contadores = {}
+        if self.fitness_cache is not None:
+            contadores["fitness"] = (self.fitness_cache.hits, self.fitness_cache.misses)
+        if isinstance(self.evaluator, IncrementalFitnessEvaluator):
+            contadores["incremental"] = (self.evaluator.genes_reaproveitados, self.evaluator.genes_simulados)
+        if isinstance(self.evaluator, SegmentFitnessEvaluator):
+            contadores["segment"] = (self.evaluator.segmentos.hits, self.evaluator.segmentos.misses)
+        return contadores
+
+    def _build_response(self,
+                        best_fitness: float,
+                        generation_reached: int,
+                        best_individual: list[int],
+                        best_roteiro: list[list[int]],
+                        cache_stats: dict | None = None,
+                        timing: dict | None = None) -> dict:
         roteiro_dict = self._format_roteiro_por_dia(best_roteiro)
 
         melhor_individuo_nomes = [self.places.iloc[idx]['places'] for idx in best_individual]
 
+        if cache_stats is None and self.fitness_cache is not None:
+            cache_stats = self.fitness_cache.stats()
+
         return self._format_response(best_fitness,
                                      generation_reached,
                                      best_individual,
                                      melhor_individuo_nomes,
-                                     roteiro_dict)
+                                     roteiro_dict,
+                                     cache_stats,
+                                     timing)
 
-    def _format_roteiro_por_dia(self, best_roteiro):
+    def _format_roteiro_por_dia(self, best_roteiro, log: bool = True):
         roteiro_dict = {}
         for i, dia in enumerate(best_roteiro):
             data = self.start_date + timedelta(days=i)
@@ -104,7 +387,8 @@ class TravelGeneticAlgorithm:
                     "longitude": float(lugar['longitude'])
                 })
             roteiro_dict[data_str] = {"locais": locais}
-            logging.info(f"  Dia {i+1} ({data_str}): {[l['nome'] for l in locais]}")
+            if log:
+                logging.info(f"  Dia {i+1} ({data_str}): {[l['nome'] for l in locais]}")
         return roteiro_dict
 
     def _format_response(self,
@@ -112,140 +396,204 @@ class TravelGeneticAlgorithm:
                          generation_reached: int,
                          best_individual: list[int],
                          melhor_individuo_nomes: list[str],
-                         roteiro_dict: dict) -> dict:
+                         roteiro_dict: dict,
+                         cache_stats: dict | None = None,
+                         timing: dict | None = None) -> dict:
         return {
             "melhor_fitness": round(float(best_fitness), 4),
             "geracoes_executadas": generation_reached,
             "melhor_individuo_idx": best_individual,
             "melhor_individuo_nomes": melhor_individuo_nomes,
-            "roteiro_por_dia": roteiro_dict
+            "roteiro_por_dia": roteiro_dict,
+            "cache_fitness": cache_stats,
+            **(timing or {}),
         }
                        
                                                
-    def _initialize_population(self) -> None:
-        # Initialize the population with random individuals
+    def _initialize_population(self) -> np.ndarray:
+        # Initialize the population: warm start, heuristic seeds and random individuals
         try:
             logging.info(self.places.head())
             df_places_to_visit_sorted = self.places.sort_values(by="priority", ascending=False)
             indices = list(df_places_to_visit_sorted.index)
             
-            population = []
-            for _ in range(self.population_size):
-                individual = random.sample(indices, len(indices))
-                population.append(individual)
+            population = self.buffers.current
+            inicio = self._load_initial_population(population, indices)
+            inicio += self._load_seeded_individuals(population[inicio:])
+            for individual in population[inicio:]:
+                individual[:] = random.sample(indices, len(indices))
             return population
         except Exception as e:
             logging.exception(f"An error occurred while initializing the population: {e}")
             raise
 
 
+    def _load_initial_population(self, population: np.ndarray, indices: list) -> int:
+        """
+        Copia para o início de `population` os indivíduos distintos de
+        `initial_population` que são permutações válidas dos locais atuais,
+        na ordem recebida. Retorna quantos foram copiados.
+        """
+        if self.initial_population is None or len(self.initial_population) == 0:
+            return 0
+        iniciais = np.asarray(self.initial_population)
+        if iniciais.ndim != 2 or iniciais.shape[1] != population.shape[1]:
+            return 0
+
+        validos = iniciais[(np.sort(iniciais, axis=1) == np.sort(indices)).all(axis=1)]
+        _, primeiros = np.unique(validos, axis=0, return_index=True)
+        validos = validos[np.sort(primeiros)][:len(population)]
+        population[:len(validos)] = validos
+        self.warm_start_size = len(validos)
+        return len(validos)
+
+    def _load_seeded_individuals(self, population: np.ndarray) -> int:
+        """
+        Preenche o início de `population` com até `seed_ratio` da população
+        construída pelas heurísticas de `seeding`. Com orçamento de tempo, a
+        semeadura usa no máximo SEEDING_BUDGET_SHARE dele. Retorna quantos
+        foram copiados.
+        """
+        quantidade = min(len(population), round(self.seed_ratio * self.population_size))
+        deadline = None
+        if self.time_budget_ms > 0:
+            deadline = time.perf_counter() + self.time_budget_ms / 1000 * SEEDING_BUDGET_SHARE
+        individuos = seed_individuals(self.problem, self.time_min_daily, quantidade, deadline) if quantidade > 0 else []
+        for linha, individuo in zip(population, individuos):
+            linha[:] = individuo
+        self.seeded_size = len(individuos)
+        return len(individuos)
+
     def _evaluate_fitness(self):
         try:
-            fitness_scores = []
-            roteiros_por_individuo = []
-
-            dias_roteiro = self.date_utils.get_date_range(self.start_date, self.end_date) 
-            dias_da_semana = [self.date_utils.get_day_abbr(d).lower() for d in dias_roteiro]
-
-            for individuo in self.population:
-                roteiro_por_dia = []
-                dia_atual = []
-                tempo_dia = 0
-                tempo_atual = 8 * 60  # 08:00h em minutos
-                tempo_total_usado = 0
-                prioridade_bonus = 0
-                funcionamento_bonus = 0
-                deslocamento_total = 0
-                dia_index = 0
-
-                for i, idx in enumerate(individuo):
-                    lugar = self.places.iloc[idx]
-                    tempo_visita = lugar['estimated_duration_min']
-
-                    # Tempo de deslocamento entre locais
-                    if dia_atual:
-                        origem = self.places.iloc[dia_atual[-1]]['places']
-                    else:
-                        origem = 'HOTEL'
-
-                    destino = lugar['places']
-                    tempo_desloc = self.duration.loc[origem, destino]
-                    deslocamento_total += tempo_desloc
-                    tempo_total = tempo_visita + tempo_desloc
-
-                    # Verifica se cabe no dia atual
-                    if tempo_dia + tempo_total > self.time_min_daily:
-                        roteiro_por_dia.append(dia_atual)
-                        dia_atual = []
-                        tempo_dia = 0
-                        tempo_atual = 8 * 60
-                        dia_index += 1
-
-                        if dia_index >= len(dias_da_semana):
-                            break  # excedeu número de dias disponíveis
-                        # Recalcula deslocamento do hotel até novo lugar
-                        tempo_desloc = self.duration.loc['HOTEL', destino]
-                        deslocamento_total += tempo_desloc
-                        tempo_total = tempo_visita + tempo_desloc
-
-                    # Verifica horário de funcionamento
-                    dia_semana_atual = dias_da_semana[dia_index]
-                    horario_str = lugar.get(dia_semana_atual, "Closed")
-                    inicio_func, fim_func = self.time_utils.parse_time_range(horario_str)
-                    chegada = tempo_atual + tempo_desloc
-
-                    if inicio_func is not None and inicio_func <= chegada <= fim_func - tempo_visita:
-                        funcionamento_bonus += 1  # recompensa por estar dentro do horário
-                    # else: nenhuma penalização
-
-                    # Prioridade
-                    if 'priority' in lugar and lugar['priority'] == 1:
-                        prioridade_bonus += 1  # recompensa por visitar local prioritário
-
-                    dia_atual.append(idx)
-                    tempo_dia += tempo_total
-                    tempo_total_usado += tempo_total
-                    tempo_atual += tempo_total
-
-                if dia_atual:
-                    roteiro_por_dia.append(dia_atual)
-
-                # Recompensas:
-                # - quanto menos tempo de deslocamento, melhor
-                # - quanto mais locais prioritários, melhor
-                # - quanto mais locais dentro do horário, melhor
-                # - quanto menos dias usados, melhor
-
-                recompensa_total = (
-                    (len(individuo) - len(roteiro_por_dia)) * 200 +  # usar menos dias
-                    (prioridade_bonus * 100) +
-                    (funcionamento_bonus * 50) +
-                    max(1, (len(individuo) * 30 - deslocamento_total))  # recompensa por menos deslocamento
-                )
+            populacao = self.population
+            todos = range(len(populacao))
 
-                fitness_scores.append(recompensa_total)
-                roteiros_por_individuo.append(roteiro_por_dia)
+            if self.fitness_cache is None:
+                return self.evaluator.evaluate_population(populacao, self._parents_of(todos))
 
-            return fitness_scores, roteiros_por_individuo
+            fitness_scores = [None] * len(populacao)
+            roteiros_por_individuo = [None] * len(populacao)
+            chaves = [individuo.tobytes() for individuo in populacao]
+            pendentes = []
 
+            for i, chave in enumerate(chaves):
+                cached = self.fitness_cache.get(chave)
+                if cached is None:
+                    pendentes.append(i)
+                else:
+                    fitness_scores[i], roteiros_por_individuo[i] = cached
+
+            if pendentes:
+                novos_scores, novos_roteiros = self.evaluator.evaluate_population(
+                    populacao[pendentes],
+                    self._parents_of(pendentes),
+                )
+                for i, score, roteiro in zip(pendentes, novos_scores, novos_roteiros):
+                    self.fitness_cache.put(chaves[i], (score, roteiro))
+                    fitness_scores[i] = score
+                    roteiros_por_individuo[i] = roteiro
+
+            return fitness_scores, roteiros_por_individuo
         except Exception as e:
             logging.exception(f"An error occurred while evaluating fitness: {e}")
             raise
 
+    def _parents_of(self, indices) -> list[tuple] | None:
+        """
+        Pais (listas de genes lidas da população anterior) dos indivíduos em
+        `indices`; apenas a avaliação incremental os utiliza.
+        """
+        if not isinstance(self.evaluator, IncrementalFitnessEvaluator):
+            return None
+        if self.lineage is None or len(self.lineage) != len(self.population):
+            return None
+        anterior = self.buffers.next
+        return [tuple(anterior[j].tolist() for j in self.lineage[i]) for i in indices]
+
+    def _evaluate_individual(self, individuo: list[int], parents=()) -> tuple[float, list[list[int]]]:
+        if self.fitness_cache is None:
+            return self.evaluator.evaluate_individual(individuo, parents)
+
+        chave = self.buffers.key(individuo)
+        cached = self.fitness_cache.get(chave)
+        if cached is None:
+            cached = self.evaluator.evaluate_individual(individuo, parents)
+            self.fitness_cache.put(chave, cached)
+        return cached
+
+    def _apply_local_search(self,
+                            fitness_scores: list[float],
+                            roteiro_por_dia: list[list[list[int]]],
+                            generation: int) -> None:
+        """
+        Aplica 2-opt / Or-opt à elite da geração, atualizando população, fitness
+        e roteiros no lugar. Cada geração recebe uma fatia igual do orçamento
+        ainda disponível (descontada a reserva para o melhor indivíduo final).
+        """
+        budget = self.local_search_budget_ms / 1000 * (1 - LOCAL_SEARCH_FINAL_SHARE)
+        restante = budget - self._local_search_spent
+        if restante <= 0:
+            return
+
+        inicio = time.perf_counter()
+        deadline = inicio + restante / (self.generations - generation)
+        elite_indices = sorted(range(len(fitness_scores)), key=lambda i: fitness_scores[i], reverse=True)[:2]
+        for i in elite_indices:
+            individuo, score, roteiro = self.local_search.improve(self.population[i].tolist(),
+                                                                  fitness_scores[i],
+                                                                  roteiro_por_dia[i],
+                                                                  deadline)
+            self.population[i] = individuo
+            fitness_scores[i] = score
+            roteiro_por_dia[i] = roteiro
+        self._local_search_spent += time.perf_counter() - inicio
+
+    def _polish_best(self,
+                     best_individual: list[int],
+                     best_fitness: float,
+                     best_roteiro: list[list[int]]) -> tuple[list[int], float, list[list[int]]]:
+        # Usa o restante do orçamento (incluindo a reserva final) no melhor indivíduo,
+        # sem ultrapassar o orçamento de tempo da execução
+        restante = self.local_search_budget_ms / 1000 - self._local_search_spent
+        if self.time_budget_ms > 0:
+            restante = min(restante, self.time_budget_ms / 1000 - self.telemetry.elapsed())
+        if restante <= 0:
+            return best_individual, best_fitness, best_roteiro
+
+        inicio = time.perf_counter()
+        resultado = self.local_search.improve(best_individual, best_fitness, best_roteiro, inicio + restante)
+        self._local_search_spent += time.perf_counter() - inicio
+        logging.info(f"Busca local: {self.local_search.melhorias} melhorias em "
+                     f"{self._local_search_spent * 1000:.0f} ms.")
+        return resultado
+
+    def _build_evaluator(self, fitness_mode: str) -> FitnessEvaluator:
+        if fitness_mode not in FITNESS_EVALUATORS:
+            raise ValueError(f"Invalid fitness mode: {fitness_mode}. Expected one of {list(FITNESS_EVALUATORS)}")
+        if fitness_mode == "incremental":
+            # Mantém os estados de duas gerações: pais e filhos
+            return IncrementalFitnessEvaluator(self.problem, self.time_min_daily,
+                                               max_registros=2 * self.population_size)
+        return FITNESS_EVALUATORS[fitness_mode](self.problem, self.time_min_daily)
+
     def _select_parents_by_elistism_tournament(self,
                                                fitness_scores: list[float],
                                                elitismo: int,
-                                               k_torneio: int) -> list[list[int]]:
+                                               k_torneio: int) -> tuple[list[int], list[int]]:
+        """
+        Retorna os índices (na população atual) da elite e dos pais selecionados.
+        """
         try:
             # 1. Elitismo: mantém os melhores indivíduos
-            elite_indices = sorted(range(len(fitness_scores)), key=lambda i: fitness_scores[i], reverse=True)[:elitismo]
-            elite = [self.population[i] for i in elite_indices]
+            elite = sorted(range(len(fitness_scores)), key=lambda i: fitness_scores[i], reverse=True)[:elitismo]
 
             # 2. Torneio: selecionar pais
             pais = []
+            candidatos = range(len(fitness_scores))
             while len(pais) < self.population_size - elitismo:
-                competidores = random.sample(list(zip(self.population, fitness_scores)), k_torneio)
-                vencedor = max(competidores, key=lambda x: x[1])[0]
+                competidores = random.sample(candidatos, k_torneio)
+                vencedor = max(competidores, key=lambda i: fitness_scores[i])
                 pais.append(vencedor)
 
             return elite, pais
@@ -253,47 +601,33 @@ class TravelGeneticAlgorithm:
             logging.exception(f"An error occurred while selecting parents: {e}")
             raise
 
-    def _apply_crossover_ox(self, parents: list[list[int]]) -> list[list[int]]:
+    def _apply_crossover(self, population: np.ndarray, parents: list[int], children: np.ndarray) -> None:
+        """
+        Escreve em `children[k]` o filho do par de pais (k, k ^ 1), onde
+        `parents` são índices de linhas de `population`.
+        """
         try:
-            filhos = []
+            mascara = self.buffers.mascara
 
             for i in range(0, len(parents) - 1, 2):
-                pai1 = parents[i]
-                pai2 = parents[i + 1]
+                pai1 = population[parents[i]]
+                pai2 = population[parents[i + 1]]
 
                 if random.random() < self.crossover_rate:
-                    size = len(pai1)
-                    a, b = sorted(random.sample(range(size), 2))
-
-                    # 1. Copia o meio de pai1
-                    meio = pai1[a:b+1]
-
-                    # 2. Preenche o restante com genes de pai2 na ordem, pulando os que já estão no meio
-                    resto = [gene for gene in pai2 if gene not in meio]
-                    filho1 = resto[:a] + meio + resto[a:]
-
-                    # Inverte os papéis para gerar filho2
-                    meio = pai2[a:b+1]
-                    resto = [gene for gene in pai1 if gene not in meio]
-                    filho2 = resto[:a] + meio + resto[a:]
-
-                    filhos.append(filho1)
-                    filhos.append(filho2)
+                    self.crossover(pai1, pai2, children[i], children[i + 1], mascara)
                 else:
                     # Sem crossover: clones
-                    filhos.append(pai1[:])
-                    filhos.append(pai2[:])
+                    children[i] = pai1
+                    children[i + 1] = pai2
 
             # Se número ímpar, clona o último pai
             if len(parents) % 2 == 1:
-                filhos.append(parents[-1][:])
-
-            return filhos
+                children[len(parents) - 1] = population[parents[-1]]
         except Exception as e:
             logging.exception(f"An error occurred while applying crossover: {e}")
             raise
     
-    def _apply_mutation(self, children: list[list[int]]) -> list[list[int]]:
+    def _apply_mutation(self, children: np.ndarray) -> np.ndarray:
         try:
             for individuo in children:
                 if random.random() < self.mutation_rate:
@@ -0,0 +1,273 @@
+import os
+import random
+import logging
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from core.genetic.genetic_algorithm import TravelGeneticAlgorithm
+from core.genetic.telemetry import GenerationTelemetry, HistoryRecorder, merge_island_stats
+
+# Instância do algoritmo genético de cada processo worker. É criada uma única vez
+# no initializer, então os locais e a matriz de duração são enviados ao worker
+# apenas na criação do processo, e não a cada época.
+_island_ga: TravelGeneticAlgorithm | None = None
+# Estatísticas por geração da ilha, devolvidas ao processo principal a cada época
+_island_history: HistoryRecorder | None = None
+
+
+def _init_island_worker(ga_params: dict) -> None:
+    global _island_ga, _island_history
+    _island_ga = TravelGeneticAlgorithm(**ga_params)
+    _island_history = HistoryRecorder()
+    _island_ga.add_observer(_island_history)
+
+
+def _evolve_island(population: np.ndarray | None,
+                   generations: int,
+                   seed: int,
+                   migration_size: int,
+                   first_generation: int = 0,
+                   local_search_spent: float = 0.0) -> tuple[np.ndarray, list[tuple], list[list[int]], tuple[int, int],
+                                                             list[dict], float]:
+    """
+    Evolui uma ilha por `generations` gerações usando os operadores do
+    TravelGeneticAlgorithm (torneio com elitismo, crossover e mutação por troca).
+
+    Retorna a população resultante; para cada geração avaliada, o melhor
+    fitness, o melhor indivíduo, seu roteiro por dia, a diversidade da
+    população e o tempo desde o início da chamada; os `migration_size`
+    melhores indivíduos da última geração avaliada (migrantes); os acertos e
+    falhas do cache de fitness do worker nesta chamada; as estatísticas de
+    telemetria de cada geração (tempo relativo ao início da chamada); e o
+    tempo total já gasto pela ilha na busca local.
+
+    Com `local_search_budget_ms`, a elite de cada geração passa pela busca
+    local como no TravelGeneticAlgorithm; `first_generation` (geração global
+    do primeiro passo) e `local_search_spent` (gasto da ilha nas épocas
+    anteriores) repartem o orçamento entre as épocas.
+    """
+    ga = _island_ga
+    random.seed(seed)
+    ga.population = ga.buffers.load(population) if population is not None else ga._initialize_population()
+    ga.lineage = None
+    ga._local_search_spent = local_search_spent
+    cache = ga.fitness_cache
+    hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    ga.telemetry.start_run({}, ga._telemetry_counters())
+
+    historico = []
+    migrants = []
+    for step in range(generations):
+        with ga.telemetry.phase("evaluation"):
+            fitness_scores, roteiro_por_dia = ga._evaluate_fitness()
+        if ga.local_search_budget_ms > 0:
+            with ga.telemetry.phase("local_search"):
+                ga._apply_local_search(fitness_scores, roteiro_por_dia, first_generation + step)
+        current_best = max(fitness_scores)
+        best_idx = fitness_scores.index(current_best)
+        diversidade = ga._diversity(ga.population, best_idx)
+        historico.append((current_best, ga.population[best_idx].tolist(), roteiro_por_dia[best_idx],
+                          diversidade, ga.telemetry.elapsed()))
+
+        ranking = sorted(range(len(fitness_scores)), key=lambda i: fitness_scores[i], reverse=True)
+        migrants = [ga.population[i].tolist() for i in ranking[:migration_size]]
+
+        ga._adapt_rates(diversidade)
+        avaliada = ga.population
+        ga.population = ga._next_generation(fitness_scores)
+        ga.telemetry.end_generation(step, fitness_scores, avaliada, ga._telemetry_counters(),
+                                    ga._adaptive_stats(diversidade))
+
+    if cache is not None:
+        hits, misses = cache.hits - hits, cache.misses - misses
+
+    return ga.population, historico, migrants, (hits, misses), _island_history.history, ga._local_search_spent
+
+
+class IslandModelRunner:
+    """
+    Executa o algoritmo genético no modelo de ilhas: `num_islands` populações
+    independentes evoluem em paralelo em um ProcessPoolExecutor e, a cada
+    `migration_interval` gerações, os `migration_size` melhores indivíduos de
+    cada ilha migram para a ilha seguinte (topologia em anel).
+
+    Cada ilha tem `population_size` indivíduos. A resposta tem o mesmo formato
+    de `TravelGeneticAlgorithm.run`. Os observadores (`observers`) ficam no
+    processo principal e recebem, por geração, as estatísticas combinadas das ilhas.
+    """
+
+    def __init__(self,
+                 num_islands: int = 4,
+                 migration_interval: int = 5,
+                 migration_size: int = 2,
+                 max_workers: int | None = None,
+                 seed: int | None = None,
+                 **ga_params):
+        if num_islands < 1:
+            raise ValueError("num_islands must be at least 1")
+        if migration_interval < 1:
+            raise ValueError("migration_interval must be at least 1")
+
+        self.num_islands = num_islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.max_workers = max_workers or min(num_islands, os.cpu_count() or 1)
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        # Observadores e o sinal de parada não são enviados aos workers (não são
+        # serializáveis); a parada é verificada ao fim de cada época
+        self.telemetry = GenerationTelemetry(ga_params.pop("observers", None))
+        stop_event = ga_params.pop("stop_event", None)
+        # A população inicial (warm start) vai apenas para a primeira ilha
+        initial_population = ga_params.pop("initial_population", None)
+        self.ga_params = ga_params
+        # Instância local usada para a população inicial da primeira ilha e para montar a resposta final
+        self.ga = TravelGeneticAlgorithm(**ga_params, initial_population=initial_population, stop_event=stop_event)
+        # A resposta é montada pela instância local, que também notifica as melhorias
+        self.ga.telemetry = self.telemetry
+        # Populações de todas as ilhas ao final da execução
+        self.population = None
+
+    def run(self) -> dict:
+        self.telemetry.start_run({**self.ga._run_info(), "islands": self.num_islands}, {})
+        populations = [None] * self.num_islands
+        if self.ga.initial_population is not None:
+            populations[0] = self.ga._initialize_population().copy()
+        self.ga._generations_start = self.telemetry.elapsed()
+
+        best_fitness = float('-inf')
+        best_individual = None
+        best_roteiro = None
+        best_generation = 0
+        time_to_best = 0.0
+        generations_without_improvement = 0
+        generation_reached = 0
+        epoch = 0
+        cache_hits = cache_misses = 0
+        # Tempo gasto por ilha na busca local (cada ilha tem o orçamento inteiro, em paralelo)
+        local_search_spent = [0.0] * self.num_islands
+
+        with ProcessPoolExecutor(max_workers=self.max_workers,
+                                 initializer=_init_island_worker,
+                                 initargs=(self.ga_params,)) as executor:
+
+            while generation_reached < self.ga.generations:
+                generations = min(self.migration_interval, self.ga.generations - generation_reached)
+                futures = [
+                    executor.submit(_evolve_island,
+                                    population,
+                                    generations,
+                                    self._island_seed(epoch, island),
+                                    self.migration_size,
+                                    generation_reached,
+                                    local_search_spent[island])
+                    for island, population in enumerate(populations)
+                ]
+                inicio_epoca = self.telemetry.elapsed()
+                results = [future.result() for future in futures]
+                populations = [resultado[0] for resultado in results]
+                historicos = [resultado[1] for resultado in results]
+                cache_hits += sum(resultado[3][0] for resultado in results)
+                cache_misses += sum(resultado[3][1] for resultado in results)
+                local_search_spent = [resultado[5] for resultado in results]
+
+                # Melhor global por geração, considerando todas as ilhas
+                stop = False
+                for step in range(generations):
+                    current_best, individual, roteiro, _, decorrido = max(
+                        (historico[step] for historico in historicos), key=lambda x: x[0])
+                    diversidade = sum(historico[step][3] for historico in historicos) / len(results)
+                    generation = generation_reached + step
+
+                    if self.telemetry.observers:
+                        island_stats = [resultado[4][step] for resultado in results]
+                        elapsed = inicio_epoca + max(s["elapsed_s"] for s in island_stats)
+                        self.telemetry.emit(merge_island_stats(island_stats, generation, elapsed))
+
+                    if current_best > best_fitness:
+                        best_fitness = current_best
+                        best_individual = individual
+                        best_roteiro = roteiro
+                        best_generation = generation
+                        time_to_best = inicio_epoca + decorrido
+                        generations_without_improvement = 0
+                        logging.info(f"Generation {generation}: New best fitness found: {best_fitness:.2f}")
+                        self.ga._notify_new_best(generation, best_fitness, best_individual, best_roteiro)
+                    else:
+                        generations_without_improvement += 1
+
+                    if generations_without_improvement >= self.ga._stagnation_limit(diversidade):
+                        logging.info(f"Parada antecipada por estagnação após {generation + 1} gerações.")
+                        generation_reached = generation + 1
+                        stop = True
+                        break
+
+                if not stop and self.ga.stopped:
+                    generation_reached += generations
+                    logging.info(f"Execução interrompida após {generation_reached} gerações.")
+                    stop = True
+
+                proxima_epoca = min(self.migration_interval, self.ga.generations - generation_reached - generations)
+                if not stop and self.ga._out_of_time(generation_reached + generations, proxima_epoca):
+                    generation_reached += generations
+                    logging.info(f"Orçamento de tempo esgotado após {generation_reached} gerações.")
+                    stop = True
+
+                if stop:
+                    break
+
+                generation_reached += generations
+                populations = self._migrate(populations, results)
+                epoch += 1
+
+        if self.ga.local_search_budget_ms > 0 and not self.ga.stopped and best_individual is not None:
+            # Reserva final do orçamento no melhor global (as ilhas rodaram em paralelo)
+            self.ga._local_search_spent = max(local_search_spent)
+            with self.telemetry.phase("local_search"):
+                polido = self.ga._polish_best(best_individual, best_fitness, best_roteiro)
+            if polido[1] > best_fitness:
+                time_to_best = self.telemetry.elapsed()
+            best_individual, best_fitness, best_roteiro = polido
+
+        self.population = np.vstack(populations)
+        self.telemetry.end_run({"best_fitness": float(best_fitness), "generations": generation_reached})
+        logging.info(f"Modelo de ilhas finalizado após {generation_reached} gerações ({self.num_islands} ilhas).")
+        logging.info(f"Melhor fitness final: {best_fitness:.2f}")
+
+        cache_stats = None
+        if self.ga.fitness_cache is not None:
+            total = cache_hits + cache_misses
+            cache_stats = {
+                "hits": cache_hits,
+                "misses": cache_misses,
+                "hit_rate": round(cache_hits / total, 4) if total else 0.0,
+                "size": None,
+                "maxsize": self.ga.fitness_cache.maxsize,
+            }
+
+        timing = self.ga._timing_stats(time_to_best, best_generation)
+        return self.ga._build_response(best_fitness, generation_reached, best_individual, best_roteiro, cache_stats, timing)
+
+    @property
+    def warm_start_size(self) -> int:
+        return self.ga.warm_start_size
+
+    def _migrate(self, populations: list[np.ndarray], results: list) -> list[np.ndarray]:
+        """
+        Migração em anel: os melhores indivíduos da última geração avaliada de
+        cada ilha substituem os últimos indivíduos (filhos, nunca a elite) da
+        ilha seguinte.
+        """
+        if self.num_islands < 2 or self.migration_size < 1:
+            return populations
+
+        migrated = []
+        for island, population in enumerate(populations):
+            incoming = results[(island - 1) % self.num_islands][2]
+            incoming = incoming[:len(population)]
+            population = population.copy()
+            if incoming:
+                population[len(population) - len(incoming):] = incoming
+            migrated.append(population)
+        return migrated
+
+    def _island_seed(self, epoch: int, island: int) -> int:
+        return (self.seed + epoch * self.num_islands + island) % 2**32
@@ -0,0 +1,100 @@
+import time
+from typing import Callable
+from core.genetic.compiled_problem import CompiledProblem
+
+
+class LocalSearch:
+    """
+    Busca local 2-opt e Or-opt com limite de tempo, usada no estágio memético.
+
+    Os movimentos candidatos são filtrados pela variação do deslocamento na
+    matriz de duração (HOTEL como origem do primeiro local) e só então
+    confirmados pela função de fitness completa, que respeita a divisão em
+    dias e os horários de funcionamento. A busca aceita a primeira melhoria e
+    recomeça até não haver melhoria ou o prazo acabar.
+    """
+
+    def __init__(self,
+                 problem: CompiledProblem,
+                 evaluate: Callable[[list[int], tuple], tuple[float, list[list[int]]]],
+                 max_segment: int = 3):
+        self.problem = problem
+        self.evaluate = evaluate
+        self.max_segment = max_segment
+        self.melhorias = 0
+
+    def improve(self,
+                individuo: list[int],
+                fitness: float,
+                roteiro: list[list[int]],
+                deadline: float) -> tuple[list[int], float, list[list[int]]]:
+        """
+        Melhora `individuo` até `deadline` (time.perf_counter()). Retorna o
+        melhor indivíduo encontrado, seu fitness e roteiro por dia.
+
+        O prazo é verificado antes de cada avaliação: o estouro máximo é uma
+        avaliação de fitness (mais a varredura de um laço interno).
+        """
+        atual = list(individuo)
+        melhorou = True
+        while melhorou and time.perf_counter() < deadline:
+            melhorou = False
+            for vizinho in self._neighbors(atual, deadline):
+                if time.perf_counter() >= deadline:
+                    break
+                score, novo_roteiro = self.evaluate(vizinho, (atual,))
+                if score > fitness:
+                    atual, fitness, roteiro = vizinho, score, novo_roteiro
+                    self.melhorias += 1
+                    melhorou = True
+                    break
+        return atual, fitness, roteiro
+
+    def _neighbors(self, individuo: list[int], deadline: float):
+        yield from self._two_opt(individuo, deadline)
+        yield from self._or_opt(individuo, deadline)
+
+    def _travel(self, origem: int | None, destino: int | None) -> float:
+        if destino is None:
+            return 0
+        if origem is None:
+            return self.problem.hotel_travel_list[destino]
+        return self.problem.travel_rows[origem][destino]
+
+    def _two_opt(self, individuo: list[int], deadline: float):
+        # Inverte o trecho individuo[i:j + 1]
+        n = len(individuo)
+        travel = self._travel
+        for i in range(n - 1):
+            if time.perf_counter() >= deadline:
+                return
+            anterior = individuo[i - 1] if i > 0 else None
+            for j in range(i + 1, n):
+                proximo = individuo[j + 1] if j + 1 < n else None
+                antes = travel(anterior, individuo[i]) + travel(individuo[j], proximo)
+                depois = travel(anterior, individuo[j]) + travel(individuo[i], proximo)
+                if depois < antes:
+                    yield individuo[:i] + individuo[i:j + 1][::-1] + individuo[j + 1:]
+
+    def _or_opt(self, individuo: list[int], deadline: float):
+        # Move o trecho individuo[i:i + tamanho] para outra posição
+        n = len(individuo)
+        travel = self._travel
+        for tamanho in range(1, self.max_segment + 1):
+            for i in range(n - tamanho + 1):
+                if time.perf_counter() >= deadline:
+                    return
+                segmento = individuo[i:i + tamanho]
+                resto = individuo[:i] + individuo[i + tamanho:]
+                anterior = individuo[i - 1] if i > 0 else None
+                proximo = individuo[i + tamanho] if i + tamanho < n else None
+                ganho = travel(anterior, segmento[0]) + travel(segmento[-1], proximo) - travel(anterior, proximo)
+
+                for k in range(len(resto) + 1):
+                    if k == i:
+                        continue
+                    a = resto[k - 1] if k > 0 else None
+                    b = resto[k] if k < len(resto) else None
+                    custo = travel(a, segmento[0]) + travel(segmento[-1], b) - travel(a, b)
+                    if custo < ganho:
+                        yield resto[:k] + segmento + resto[k:]
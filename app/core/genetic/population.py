@@ -0,0 +1,50 @@
+import numpy as np
+
+
+class PopulationBuffers:
+    """
+    População armazenada em duas matrizes pré-alocadas (indivíduos x genes):
+    a geração atual e a próxima. Seleção, crossover e mutação escrevem
+    diretamente nas linhas da próxima matriz e `swap` troca os papéis, então
+    nenhuma lista é criada por indivíduo entre gerações.
+
+    Os genes usam int16 quando o maior índice de local cabe nele (int32 caso
+    contrário), o que também deixa as chaves do cache de fitness compactas.
+    """
+
+    def __init__(self, population_size: int, genome_length: int, max_gene: int):
+        self.dtype = np.int16 if max_gene <= np.iinfo(np.int16).max else np.int32
+        self._matrizes = (np.empty((population_size, genome_length), dtype=self.dtype),
+                          np.empty((population_size, genome_length), dtype=self.dtype))
+        self._atual = 0
+        # Máscara de trabalho dos operadores de crossover (indexada pelo gene, sempre zerada)
+        self.mascara = np.zeros(max_gene + 1, dtype=bool)
+
+    @property
+    def current(self) -> np.ndarray:
+        return self._matrizes[self._atual]
+
+    @property
+    def next(self) -> np.ndarray:
+        return self._matrizes[1 - self._atual]
+
+    def swap(self) -> np.ndarray:
+        """
+        Torna a próxima matriz a atual. A anterior continua intacta até a
+        próxima geração ser escrita (a avaliação incremental lê os pais nela).
+        """
+        self._atual = 1 - self._atual
+        return self.current
+
+    def load(self, population) -> np.ndarray:
+        """
+        Copia `population` (matriz ou lista de listas) para a matriz atual.
+        """
+        self.current[:] = population
+        return self.current
+
+    def key(self, individuo) -> bytes:
+        """
+        Chave compacta de um indivíduo (linha da matriz ou lista de genes).
+        """
+        return np.asarray(individuo, dtype=self.dtype).tobytes()
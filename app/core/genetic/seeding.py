@@ -0,0 +1,229 @@
+import time
+import random
+import numpy as np
+from typing import Callable
+from core.genetic.compiled_problem import CompiledProblem, CLOSED
+from core.genetic.fitness import INICIO_DIA
+
+# Heurísticas construtivas para semear parte da população inicial. Todas
+# devolvem uma permutação das posições dos locais em `problem` e rodam em
+# O(n²) com operações vetorizadas sobre a matriz de deslocamento. Com um
+# `deadline` (time.perf_counter()), a construção é interrompida quando ele
+# passa e os locais ainda livres vão para o final, na ordem das posições.
+
+# Deslocamento usado no lugar de pares sem duração (NaN): nunca escolhido antes de um par conhecido
+SEM_ROTA = 1e9
+# Variantes aleatórias: sorteia entre os `CANDIDATOS_ALEATORIOS` melhores candidatos a cada passo
+CANDIDATOS_ALEATORIOS = 3
+
+
+def _escolher(custo: np.ndarray, permitidos: np.ndarray, aleatorio: bool) -> int:
+    """
+    Posição de menor `custo` entre as `permitidos`; nas variantes aleatórias,
+    sorteia entre as CANDIDATOS_ALEATORIOS de menor custo.
+    """
+    candidatos = np.flatnonzero(permitidos)
+    custos = custo[candidatos]
+    if not aleatorio or len(candidatos) == 1:
+        return int(candidatos[np.argmin(custos)])
+    k = min(CANDIDATOS_ALEATORIOS, len(candidatos))
+    melhores = candidatos[np.argpartition(custos, k - 1)[:k]]
+    return int(random.choice(melhores.tolist()))
+
+
+def _expirou(deadline: float | None) -> bool:
+    return deadline is not None and time.perf_counter() >= deadline
+
+
+def _construir_por_dias(problem: CompiledProblem,
+                        time_min_daily: int,
+                        escolher: Callable[[np.ndarray, np.ndarray, int, float], int],
+                        deadline: float | None = None) -> list[int]:
+    """
+    Monta o roteiro dia a dia, com a mesma contagem de tempo da função de
+    fitness: cada dia parte do HOTEL às INICIO_DIA e recebe locais enquanto
+    deslocamento + visita couberem em `time_min_daily`. Como o dia só é
+    fechado quando nenhum local livre cabe nele, a divisão gulosa da fitness
+    reproduz os mesmos dias.
+
+    `escolher(deslocamento, cabe, dia, relogio)` devolve o próximo local entre
+    os que cabem no dia. Locais que não cabem em nenhum dia vão para o final.
+    """
+    travel = np.nan_to_num(problem.travel, nan=SEM_ROTA)
+    hotel_travel = np.nan_to_num(problem.hotel_travel, nan=SEM_ROTA)
+    visita = problem.visit_duration
+    livres = np.ones(problem.size, dtype=bool)
+    roteiro = []
+
+    for dia in range(problem.trip_days):
+        atual = None
+        tempo_dia = 0
+        while True:
+            if _expirou(deadline):
+                return roteiro + np.flatnonzero(livres).tolist()
+            deslocamento = hotel_travel if atual is None else travel[atual]
+            cabe = livres & (tempo_dia + deslocamento + visita <= time_min_daily)
+            if not cabe.any():
+                break
+            atual = escolher(deslocamento, cabe, dia, INICIO_DIA + tempo_dia)
+            livres[atual] = False
+            roteiro.append(atual)
+            tempo_dia += deslocamento[atual] + visita[atual]
+        if atual is None:
+            break
+
+    return roteiro + np.flatnonzero(livres).tolist()
+
+
+def nearest_neighbor(problem: CompiledProblem,
+                     time_min_daily: int,
+                     aleatorio: bool = False,
+                     deadline: float | None = None) -> list[int]:
+    """
+    Vizinho mais próximo a partir do HOTEL: o próximo local é o mais próximo
+    do atual entre os que ainda cabem no dia; sem nenhum, começa outro dia.
+    """
+    def escolher(deslocamento, cabe, dia, relogio):
+        return _escolher(deslocamento, cabe, aleatorio)
+
+    return _construir_por_dias(problem, time_min_daily, escolher, deadline)
+
+
+def priority_first(problem: CompiledProblem,
+                   time_min_daily: int,
+                   aleatorio: bool = False,
+                   deadline: float | None = None) -> list[int]:
+    """
+    Prioritários primeiro, respeitando o horário de funcionamento: o próximo
+    local do dia é o mais próximo do primeiro grupo não vazio entre
+    prioritários abertos na chegada, demais abertos, prioritários fechados e
+    demais fechados.
+
+    Os locais são acrescentados ao final do dia (a única posição de inserção
+    que não desloca o horário das visitas já programadas), o que mantém a
+    heurística em O(n²).
+    """
+    visita = problem.visit_duration
+    ultimo_dia = problem.trip_days - 1
+
+    def escolher(deslocamento, cabe, dia, relogio):
+        chegada = (relogio + deslocamento)[:, None]
+        inicio = problem.opening_start[:, min(dia, ultimo_dia)]
+        fim = problem.opening_end[:, min(dia, ultimo_dia)]
+        aberto = ((inicio != CLOSED) & (inicio <= chegada) & (chegada <= fim - visita[:, None])).any(axis=1)
+        for grupo in (problem.is_priority & aberto, aberto, problem.is_priority):
+            if (cabe & grupo).any():
+                return _escolher(deslocamento, cabe & grupo, aleatorio)
+        return _escolher(deslocamento, cabe, aleatorio)
+
+    return _construir_por_dias(problem, time_min_daily, escolher, deadline)
+
+
+def cheapest_insertion(problem: CompiledProblem,
+                       time_min_daily: int,
+                       aleatorio: bool = False,
+                       deadline: float | None = None) -> list[int]:
+    """
+    Inserção mais barata: a rota parte do HOTEL e, a cada passo, recebe o
+    local livre cujo acréscimo de deslocamento na melhor posição é o menor.
+    A divisão em dias fica a cargo da fitness. A variante aleatória começa
+    com um local sorteado na rota.
+
+    Cada local livre guarda o custo e a aresta (origem -> sucessor) da sua
+    melhor inserção; após uma inserção só as duas arestas novas são testadas,
+    e apenas quem perdeu a própria aresta é recalculado contra a rota toda.
+    """
+    n = problem.size
+    if n == 0:
+        return []
+    hotel, fim = n, n + 1
+    # Matriz com o HOTEL (origem) e um fim virtual (a rota termina sem custo de volta)
+    custo = np.full((n + 2, n + 2), SEM_ROTA)
+    custo[:n, :n] = np.nan_to_num(problem.travel, nan=SEM_ROTA)
+    custo[hotel, :n] = np.nan_to_num(problem.hotel_travel, nan=SEM_ROTA)
+    custo[:, fim] = 0
+
+    # Colunas contíguas: custo[:, j] é lido como chegada[j]
+    chegada = np.ascontiguousarray(custo.T)
+
+    sucessor = np.full(n + 2, -1, dtype=np.int64)
+    sucessor[hotel] = fim
+    na_rota = np.zeros(n + 2, dtype=bool)
+    na_rota[hotel] = True
+    livres = np.ones(n, dtype=bool)
+    # Locais já inseridos ficam com custo infinito e nunca são atualizados
+    melhor_custo = custo[hotel, :n] + custo[:n, fim] - custo[hotel, fim]
+    melhor_origem = np.full(n, hotel, dtype=np.int64)
+
+    proximo = random.randrange(n) if aleatorio else int(np.argmin(melhor_custo))
+    for _ in range(n):
+        if _expirou(deadline):
+            break
+        a = int(melhor_origem[proximo])
+        b = int(sucessor[a])
+        sucessor[a], sucessor[proximo] = proximo, b
+        na_rota[proximo] = True
+        livres[proximo] = False
+        melhor_custo[proximo] = np.inf
+
+        via_a = custo[a, :n] + chegada[proximo, :n] - custo[a, proximo]
+        via_proximo = custo[proximo, :n] + chegada[b, :n] - custo[proximo, b]
+        novo = np.minimum(via_a, via_proximo)
+        melhora = livres & (novo < melhor_custo)
+        np.copyto(melhor_custo, novo, where=melhora)
+        np.copyto(melhor_origem, np.where(via_a <= via_proximo, a, proximo), where=melhora)
+
+        # Quem tinha (a, b) como melhor aresta e não melhorou: recalcula contra a rota toda
+        perdidos = np.flatnonzero(livres & (melhor_origem == a) & ~melhora)
+        if len(perdidos):
+            origens = np.flatnonzero(na_rota)
+            destinos = sucessor[origens]
+            acrescimo = (custo[origens[:, None], perdidos]
+                         + chegada[destinos[:, None], perdidos]
+                         - custo[origens, destinos][:, None])
+            melhor = np.argmin(acrescimo, axis=0)
+            melhor_custo[perdidos] = acrescimo[melhor, np.arange(len(perdidos))]
+            melhor_origem[perdidos] = origens[melhor]
+
+        if not livres.any():
+            break
+        proximo = int(np.argmin(melhor_custo))
+
+    roteiro = []
+    atual = int(sucessor[hotel])
+    while atual != fim:
+        roteiro.append(atual)
+        atual = int(sucessor[atual])
+    return roteiro + np.flatnonzero(livres).tolist()
+
+
+# Heurísticas usadas para semear a população, na ordem em que são aplicadas
+SEEDING_HEURISTICS: dict[str, Callable[[CompiledProblem, int, bool, float | None], list[int]]] = {
+    "nearest_neighbor": nearest_neighbor,
+    "cheapest_insertion": cheapest_insertion,
+    "priority_first": priority_first,
+}
+
+
+def seed_individuals(problem: CompiledProblem,
+                     time_min_daily: int,
+                     quantidade: int,
+                     deadline: float | None = None) -> list[list[int]]:
+    """
+    Até `quantidade` indivíduos distintos: a versão determinística de cada
+    heurística e, em seguida, variantes aleatórias delas alternadamente.
+    Nenhuma heurística começa depois de `deadline` (time.perf_counter()), e a
+    que estiver em andamento é interrompida nele.
+    """
+    heuristicas = list(SEEDING_HEURISTICS.values())
+    individuos = []
+    vistos = set()
+    for tentativa in range(3 * quantidade):
+        if len(individuos) >= quantidade or _expirou(deadline):
+            break
+        heuristica = heuristicas[tentativa % len(heuristicas)]
+        individuo = heuristica(problem, time_min_daily, tentativa >= len(heuristicas), deadline)
+        if tuple(individuo) not in vistos:
+            vistos.add(tuple(individuo))
+            individuos.append(individuo)
+    return individuos
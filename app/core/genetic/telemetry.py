@@ -0,0 +1,301 @@
+import os
+import json
+import math
+import time
+import statistics
+import numpy as np
+from contextlib import contextmanager
+from typing import Callable, Iterable
+
+# Fases de cada geração medidas pela telemetria
+PHASES = ("evaluation", "local_search", "selection", "crossover", "mutation")
+
+
+class GenerationObserver:
+    """
+    Interface dos observadores de execução do algoritmo genético. Os métodos
+    padrão não fazem nada; basta sobrescrever os eventos de interesse.
+
+    `on_generation` recebe um dict com:
+    - generation, elapsed_s (desde o início da execução)
+    - timings_ms: tempo de cada fase da geração (evaluation, local_search,
+      selection, crossover, mutation)
+    - best_fitness, mean_fitness, fitness_std
+    - unique_ratio: fração de indivíduos distintos na população (diversidade)
+    - cache: acertos, falhas e taxa de acerto da geração (fitness_cache e, no
+      modo incremental, genes reaproveitados / simulados)
+    - diversity: fração de genes diferentes do melhor indivíduo; mutation_rate
+      e crossover_rate: taxas usadas na geração (variam no modo adaptativo)
+
+    `on_new_best` recebe, a cada melhoria, generation, melhor_fitness,
+    melhor_individuo_idx e roteiro_por_dia (mesmo formato da resposta final).
+    """
+
+    def on_run_start(self, info: dict) -> None:
+        pass
+
+    def on_generation(self, stats: dict) -> None:
+        pass
+
+    def on_new_best(self, best: dict) -> None:
+        pass
+
+    def on_run_end(self, summary: dict) -> None:
+        pass
+
+
+class CallbackObserver(GenerationObserver):
+    """
+    Adapta uma função `callback(stats)` ao evento `on_generation`.
+    """
+
+    def __init__(self, callback: Callable[[dict], None]):
+        self.callback = callback
+
+    def on_generation(self, stats: dict) -> None:
+        self.callback(stats)
+
+
+class HistoryRecorder(GenerationObserver):
+    """
+    Guarda as estatísticas de todas as gerações (para gráficos de convergência).
+    """
+
+    def __init__(self):
+        self.info = None
+        self.history = []
+        self.summary = None
+
+    def on_run_start(self, info: dict) -> None:
+        self.info = info
+        self.history = []
+        self.summary = None
+
+    def on_generation(self, stats: dict) -> None:
+        self.history.append(stats)
+
+    def on_run_end(self, summary: dict) -> None:
+        self.summary = summary
+
+
+class JsonlExporter(GenerationObserver):
+    """
+    Grava um evento JSON por linha (run_start, generation, run_end) em `path`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def on_run_start(self, info: dict) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "a")
+        self._write({"event": "run_start", **info})
+
+    def on_generation(self, stats: dict) -> None:
+        self._write({"event": "generation", **stats})
+
+    def on_run_end(self, summary: dict) -> None:
+        self._write({"event": "run_end", **summary})
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, event: dict) -> None:
+        if self._file is None:
+            return
+        self._file.write(json.dumps(event, default=str) + "\n")
+        self._file.flush()
+
+
+class PrometheusTextExporter(GenerationObserver):
+    """
+    Mantém em `path` as métricas da última geração no formato texto do
+    Prometheus (para o textfile collector do node_exporter). O arquivo é
+    reescrito de forma atômica a cada geração.
+    """
+
+    def __init__(self, path: str, prefix: str = "travel_planner_ga", labels: dict | None = None):
+        self.path = path
+        self.prefix = prefix
+        self.labels = labels or {}
+
+    def on_generation(self, stats: dict) -> None:
+        metricas = [
+            ("generation", "Última geração avaliada", {}, stats["generation"]),
+            ("elapsed_seconds", "Tempo desde o início da execução", {}, stats["elapsed_s"]),
+            ("best_fitness", "Melhor fitness da geração", {}, stats["best_fitness"]),
+            ("mean_fitness", "Fitness médio da geração", {}, stats["mean_fitness"]),
+            ("fitness_std", "Desvio padrão do fitness da geração", {}, stats["fitness_std"]),
+            ("unique_ratio", "Fração de indivíduos distintos", {}, stats["unique_ratio"]),
+        ]
+        metricas += [
+            (chave, ajuda, {}, stats[chave])
+            for chave, ajuda in (("diversity", "Fração de genes diferentes do melhor indivíduo"),
+                                 ("mutation_rate", "Taxa de mutação da geração"),
+                                 ("crossover_rate", "Taxa de crossover da geração"))
+            if chave in stats
+        ]
+        metricas += [
+            ("phase_seconds", "Tempo de cada fase da geração", {"phase": fase}, ms / 1000)
+            for fase, ms in stats["timings_ms"].items()
+        ]
+        metricas += [
+            ("cache_hit_rate", "Taxa de acerto do cache na geração", {"cache": nome}, valores["hit_rate"])
+            for nome, valores in stats["cache"].items()
+        ]
+        self._write(metricas)
+
+    def _write(self, metricas: list[tuple[str, str, dict, float]]) -> None:
+        linhas = []
+        vistos = set()
+        for nome, ajuda, labels, valor in metricas:
+            nome = f"{self.prefix}_{nome}"
+            if nome not in vistos:
+                vistos.add(nome)
+                linhas.append(f"# HELP {nome} {ajuda}")
+                linhas.append(f"# TYPE {nome} gauge")
+            todos = {**self.labels, **labels}
+            rotulos = ",".join(f'{k}="{v}"' for k, v in todos.items())
+            linhas.append(f"{nome}{{{rotulos}}} {valor}" if rotulos else f"{nome} {valor}")
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporario = f"{self.path}.tmp"
+        with open(temporario, "w") as f:
+            f.write("\n".join(linhas) + "\n")
+        os.replace(temporario, self.path)
+
+
+class GenerationTelemetry:
+    """
+    Mede as fases de cada geração e entrega as estatísticas aos observadores.
+    Sem observadores, apenas os tempos das fases são acumulados.
+    """
+
+    def __init__(self, observers: Iterable[GenerationObserver | Callable[[dict], None]] | None = None):
+        self.observers = [
+            observer if isinstance(observer, GenerationObserver) else CallbackObserver(observer)
+            for observer in observers or ()
+        ]
+        self.timings = dict.fromkeys(PHASES, 0.0)
+        self._inicio = time.perf_counter()
+        self._contadores = {}
+
+    def add_observer(self, observer: GenerationObserver | Callable[[dict], None]) -> None:
+        if not isinstance(observer, GenerationObserver):
+            observer = CallbackObserver(observer)
+        self.observers.append(observer)
+
+    def start_run(self, info: dict, counters: dict[str, tuple[int, int]]) -> None:
+        self._inicio = time.perf_counter()
+        self._contadores = counters
+        self.timings = dict.fromkeys(PHASES, 0.0)
+        for observer in self.observers:
+            observer.on_run_start(info)
+
+    @contextmanager
+    def phase(self, nome: str):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[nome] += time.perf_counter() - inicio
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._inicio
+
+    def end_generation(self,
+                       generation: int,
+                       fitness_scores: list[float],
+                       population: list[list[int]],
+                       counters: dict[str, tuple[int, int]],
+                       extra: dict | None = None) -> dict | None:
+        """
+        Fecha a geração: monta as estatísticas, notifica os observadores e
+        zera os tempos das fases. `extra` é acrescentado às estatísticas
+        (ex.: diversidade e taxas atuais). Retorna as estatísticas (None sem
+        observadores).
+        """
+        timings, self.timings = self.timings, dict.fromkeys(PHASES, 0.0)
+        anteriores, self._contadores = self._contadores, counters
+        if not self.observers:
+            return None
+
+        stats = {
+            "generation": generation,
+            "elapsed_s": round(self.elapsed(), 6),
+            "timings_ms": {fase: round(segundos * 1000, 4) for fase, segundos in timings.items()},
+            "best_fitness": float(max(fitness_scores)),
+            "mean_fitness": float(statistics.fmean(fitness_scores)),
+            "fitness_std": float(statistics.pstdev(fitness_scores)),
+            "unique_ratio": round(_distinct(population) / len(population), 4),
+            "cache": {
+                nome: _hit_stats(acertos - anteriores.get(nome, (0, 0))[0],
+                                 falhas - anteriores.get(nome, (0, 0))[1])
+                for nome, (acertos, falhas) in counters.items()
+            },
+            **(extra or {}),
+        }
+        for observer in self.observers:
+            observer.on_generation(stats)
+        return stats
+
+    def emit(self, stats: dict) -> None:
+        for observer in self.observers:
+            observer.on_generation(stats)
+
+    def new_best(self, best: dict) -> None:
+        for observer in self.observers:
+            observer.on_new_best(best)
+
+    def end_run(self, summary: dict) -> None:
+        for observer in self.observers:
+            observer.on_run_end({**summary, "elapsed_s": round(self.elapsed(), 6)})
+
+
+def merge_island_stats(island_stats: list[dict], generation: int, elapsed_s: float) -> dict:
+    """
+    Combina as estatísticas de uma mesma geração de várias ilhas (com
+    populações do mesmo tamanho): melhor = máximo, média e desvio padrão da
+    população total, tempos e contadores de cache somados.
+    """
+    medias = [s["mean_fitness"] for s in island_stats]
+    media = statistics.fmean(medias)
+    variancia = statistics.fmean(s["fitness_std"] ** 2 + s["mean_fitness"] ** 2 for s in island_stats) - media ** 2
+
+    cache = {}
+    for s in island_stats:
+        for nome, valores in s["cache"].items():
+            acertos, falhas = cache.get(nome, (0, 0))
+            cache[nome] = (acertos + valores["hits"], falhas + valores["misses"])
+
+    return {
+        "generation": generation,
+        "elapsed_s": round(elapsed_s, 6),
+        "timings_ms": {fase: round(sum(s["timings_ms"].get(fase, 0.0) for s in island_stats), 4) for fase in PHASES},
+        "best_fitness": max(s["best_fitness"] for s in island_stats),
+        "mean_fitness": media,
+        "fitness_std": math.sqrt(max(variancia, 0.0)),
+        "unique_ratio": round(statistics.fmean(s["unique_ratio"] for s in island_stats), 4),
+        "cache": {nome: _hit_stats(acertos, falhas) for nome, (acertos, falhas) in cache.items()},
+        "islands": len(island_stats),
+        # Diversidade e taxas atuais: média das ilhas
+        **{chave: round(statistics.fmean(s[chave] for s in island_stats), 4)
+           for chave in ("diversity", "mutation_rate", "crossover_rate")
+           if all(chave in s for s in island_stats)},
+    }
+
+
+def _distinct(population) -> int:
+    if isinstance(population, np.ndarray):
+        return len(np.unique(population, axis=0))
+    return len({tuple(individuo) for individuo in population})
+
+
+def _hit_stats(acertos: int, falhas: int) -> dict:
+    total = acertos + falhas
+    return {"hits": acertos, "misses": falhas, "hit_rate": round(acertos / total, 4) if total else 0.0}
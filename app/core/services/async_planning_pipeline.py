@@ -0,0 +1,206 @@
+import httpx
+import asyncio
+import logging
+import pandas as pd
+from typing import AsyncIterator, Callable
+from core.api.open_api import OpenAi
+from core.utils.geo_utils import GeoUtils
+from core.utils.data_frame_utils import DataFrameUtils
+from core.api.google.routes_api import RoutesClient
+from core.api.google.geocoding_api import GeoCodingClient
+from core.api.estimated_routes_api import EstimatedRoutesClient
+
+# Locais sugeridos a mais disso do hotel são geocodificados de novo
+MAX_PLACE_DISTANCE_KM = 100
+
+
+class AsyncPlanningPipeline:
+    """
+    Pipeline assíncrono do fluxo por texto.
+
+    A geocodificação do hotel e a sugestão de locais (OpenAI) começam juntas.
+    Com `stream_places` a resposta da OpenAI é lida em streaming e cada lote
+    de locais (já com coordenadas) entra no pipeline assim que chega:
+    coordenadas que parecem erradas (inválidas ou longe do hotel) são
+    corrigidas pela geocodificação em lote de "nome, destino", e os blocos da
+    matriz entre os locais novos e os já conhecidos são buscados enquanto o
+    restante da resposta ainda está sendo gerado. Os blocos entre locais não
+    esperam o hotel; só a linha e a coluna do HOTEL esperam a geocodificação. Todas as chamadas HTTP
+    compartilham um httpx.AsyncClient com pool de conexões, então o tempo
+    total fica próximo da chamada mais lenta, e não da soma delas.
+
+    `stream` entrega resultados parciais como eventos:
+    - {"type": "places", "data": DataFrame com o lote de locais recebido}
+    - {"type": "hotel", "data": (lat, lng)}
+    - {"type": "matrix_tile", "elements": elementos do bloco, "fetched": elementos buscados até agora}
+    - {"type": "done", "data": (locais, duração, distância, hotel)}
+    """
+
+    def __init__(self,
+                 geo_client: GeoCodingClient,
+                 open_ai: OpenAi,
+                 routes_client: RoutesClient | EstimatedRoutesClient,
+                 max_connections: int = 10,
+                 timeout_seconds: float = 60,
+                 stream_places: bool = True):
+        self.geo_client = geo_client
+        self.open_ai = open_ai
+        self.routes_client = routes_client
+        self.max_connections = max_connections
+        self.timeout_seconds = timeout_seconds
+        self.stream_places = stream_places
+
+    def run(self,
+            hotel_name: str,
+            on_event: Callable[[dict], None] | None = None) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, tuple[float, float]]:
+        """
+        Executa o pipeline de forma síncrona (para uso no Streamlit), repassando
+        os eventos parciais para `on_event`.
+        """
+        async def consume():
+            async for event in self.stream(hotel_name):
+                if on_event is not None:
+                    on_event(event)
+                if event["type"] == "done":
+                    return event["data"]
+
+        return asyncio.run(consume())
+
+    async def stream(self, hotel_name: str) -> AsyncIterator[dict]:
+        queue = asyncio.Queue()
+        worker = asyncio.create_task(self._plan_safely(hotel_name, queue))
+
+        try:
+            while True:
+                event = await queue.get()
+                if event["type"] == "error":
+                    raise event["error"]
+                yield event
+                if event["type"] == "done":
+                    return
+        finally:
+            worker.cancel()
+
+    async def _plan_safely(self, hotel_name: str, queue: asyncio.Queue) -> None:
+        try:
+            await self._plan(hotel_name, queue)
+        except Exception as e:
+            await queue.put({"type": "error", "error": e})
+
+    async def _plan(self, hotel_name: str, queue: asyncio.Queue) -> None:
+        limits = httpx.Limits(max_connections=self.max_connections,
+                              max_keepalive_connections=self.max_connections)
+        async with httpx.AsyncClient(limits=limits, timeout=self.timeout_seconds) as client:
+            hotel_task = asyncio.create_task(self.geo_client.get_coordinates_async(client, hotel_name))
+            # O HOTEL ocupa a primeira linha/coluna (como em concatenate_dataframe);
+            # as coordenadas entram quando a geocodificação termina
+            coordinates = [None]
+            matrix = [[None]]
+            semaphore = asyncio.Semaphore(getattr(self.routes_client, "max_workers", 1))
+            batches = []
+            blocks = []
+            fetched = 0
+
+            def on_tile(origins: int, destinations: int) -> None:
+                nonlocal fetched
+                fetched += origins * destinations
+                queue.put_nowait({"type": "matrix_tile", "elements": origins * destinations, "fetched": fetched})
+
+            async def resolve_hotel() -> tuple[float, float]:
+                hotel_coordinates = await hotel_task
+                coordinates[0] = hotel_coordinates
+                await queue.put({"type": "hotel", "data": hotel_coordinates})
+                return hotel_coordinates
+
+            async def fill_hotel_block(new: range) -> None:
+                # Só os blocos da linha/coluna do HOTEL esperam a geocodificação
+                await hotel_ready
+                await asyncio.gather(
+                    self.routes_client.fill_block_async(client, coordinates, matrix, [0], new, semaphore, on_tile),
+                    self.routes_client.fill_block_async(client, coordinates, matrix, new, [0], semaphore, on_tile))
+
+            hotel_ready = asyncio.create_task(resolve_hotel())
+            try:
+                async for batch in self._places_batches():
+                    # Sem o hotel ainda, coordenadas suspeitas são as longe do ponto mediano do lote
+                    center = hotel_ready.result() if hotel_ready.done() else None
+                    batch = await self._fix_suspicious_coordinates(client, batch, center)
+                    batches.append(batch)
+                    await queue.put({"type": "places", "data": batch})
+
+                    known = range(1, len(coordinates))
+                    coordinates.extend(zip(batch['latitude'], batch['longitude']))
+                    for row in matrix:
+                        row.extend([None] * len(batch))
+                    matrix.extend([None] * len(coordinates) for _ in range(len(batch)))
+                    new = range(len(known) + 1, len(coordinates))
+
+                    if isinstance(self.routes_client, RoutesClient):
+                        blocks.append(asyncio.create_task(self.routes_client.fill_block_async(
+                            client, coordinates, matrix, new, range(1, len(coordinates)), semaphore, on_tile)))
+                        blocks.append(asyncio.create_task(self.routes_client.fill_block_async(
+                            client, coordinates, matrix, known, new, semaphore, on_tile)))
+                        blocks.append(asyncio.create_task(fill_hotel_block(new)))
+                hotel_coordinates = await hotel_ready
+                await asyncio.gather(*blocks)
+            except Exception:
+                hotel_task.cancel()
+                hotel_ready.cancel()
+                for block in blocks:
+                    block.cancel()
+                raise
+
+            if not batches:
+                raise ValueError("No tourist places were suggested")
+            tourist_places_df = pd.concat(batches, ignore_index=True)
+            tourist_places_df_with_hotel = DataFrameUtils.concatenate_dataframe(hotel_coordinates,
+                                                                                tourist_places_df)
+
+            if isinstance(self.routes_client, RoutesClient):
+                if self.routes_client.estimator is not None:
+                    self.routes_client._fill_missing_pairs(matrix,
+                                                           tourist_places_df_with_hotel['latitude'],
+                                                           tourist_places_df_with_hotel['longitude'])
+                names = tourist_places_df_with_hotel['places']
+                combined_matrix = pd.DataFrame(matrix, index=names, columns=names)
+                duration_df, distance_df = self.routes_client._split_matrix(combined_matrix)
+            else:
+                duration_df, distance_df = self.routes_client.compute_duration_and_distance(tourist_places_df_with_hotel)
+
+            await queue.put({"type": "done",
+                             "data": (tourist_places_df, duration_df, distance_df, hotel_coordinates)})
+
+    async def _places_batches(self) -> AsyncIterator[pd.DataFrame]:
+        if self.stream_places:
+            async for batch in self.open_ai.stream_places_tourist_points_async():
+                yield batch
+        else:
+            yield await self.open_ai.get_places_tourist_points_async()
+
+    async def _fix_suspicious_coordinates(self,
+                                          client: httpx.AsyncClient,
+                                          tourist_places_df: pd.DataFrame,
+                                          center: tuple[float, float] | None) -> pd.DataFrame:
+        """
+        Geocodifica de novo os locais cujas coordenadas parecem erradas (longe
+        de `center`, o hotel, ou do ponto mediano do lote). Os que não forem
+        encontrados mantêm as coordenadas sugeridas.
+        """
+        suspicious = GeoUtils.find_suspicious_coordinates(tourist_places_df['latitude'],
+                                                          tourist_places_df['longitude'],
+                                                          MAX_PLACE_DISTANCE_KM,
+                                                          center=center)
+        if not suspicious.any():
+            return tourist_places_df
+
+        tourist_places_df = tourist_places_df.copy()
+        for column in ('latitude', 'longitude'):
+            tourist_places_df[column] = pd.to_numeric(tourist_places_df[column], errors='coerce').astype(float)
+        rows = tourist_places_df.index[suspicious]
+        queries = [f"{name}, {self.open_ai.place_name}" for name in tourist_places_df.loc[rows, 'places']]
+        results = await self.geo_client.get_coordinates_batch_async(client, queries)
+        for row, coordinates in zip(rows, results):
+            if coordinates is not None:
+                tourist_places_df.loc[row, ['latitude', 'longitude']] = coordinates
+        logging.info(f"Re-geocoded {sum(r is not None for r in results)} of {len(rows)} suspicious places")
+        return tourist_places_df
@@ -0,0 +1,148 @@
+import uuid
+import logging
+import threading
+from typing import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from core.genetic.telemetry import GenerationObserver
+
+# Estados de um job: aguardando um worker, executando e os estados finais
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+
+class GAJob(GenerationObserver):
+    """
+    Handle de uma execução do algoritmo genético em segundo plano. Recebe as
+    estatísticas de cada geração e o melhor roteiro a cada melhoria (como
+    observador), e permite cancelar a execução ou aceitar o melhor atual.
+
+    Os métodos podem ser chamados de outra thread (a da interface, que
+    consulta `progress` periodicamente).
+    """
+
+    def __init__(self, job_id: str):
+        self.id = job_id
+        self.status = PENDING
+        self.error = None
+        # Sinal verificado pelo algoritmo ao fim de cada geração
+        self.stop_event = threading.Event()
+        # Informações da execução definidas por quem executa o job (ex.: cache, warm start)
+        self.run_info = {}
+        self._history = []
+        self._best = None
+        self._cancelled = False
+        self._future: Future | None = None
+        self._lock = threading.Lock()
+
+    def on_run_start(self, info: dict) -> None:
+        with self._lock:
+            self._history = []
+
+    def on_generation(self, stats: dict) -> None:
+        with self._lock:
+            self._history.append(stats)
+
+    def on_new_best(self, best: dict) -> None:
+        with self._lock:
+            self._best = best
+
+    def cancel(self) -> None:
+        """
+        Interrompe a execução e descarta o resultado.
+        """
+        self._cancelled = True
+        self.stop_event.set()
+        if self._future is not None and self._future.cancel():
+            self.status = CANCELLED
+
+    def accept_current_best(self) -> None:
+        """
+        Interrompe a execução ao fim da geração atual; o resultado é o melhor
+        indivíduo encontrado até ali.
+        """
+        self.stop_event.set()
+
+    def done(self) -> bool:
+        return self.status in (DONE, CANCELLED, FAILED)
+
+    def result(self, timeout: float | None = None) -> dict | None:
+        """
+        Aguarda o fim da execução. Retorna a resposta do algoritmo genético ou
+        None se o job foi cancelado.
+        """
+        if self._future is None or self._future.cancelled():
+            return None
+        return self._future.result(timeout)
+
+    @property
+    def history(self) -> list[dict]:
+        with self._lock:
+            return list(self._history)
+
+    def progress(self) -> dict:
+        """
+        Estado atual: status, gerações concluídas, melhor fitness e o melhor
+        roteiro até agora (`best`, no formato de `on_new_best`).
+        """
+        with self._lock:
+            ultima = self._history[-1] if self._history else None
+            return {
+                "id": self.id,
+                "status": self.status,
+                "generations": len(self._history),
+                "elapsed_s": ultima["elapsed_s"] if ultima else 0.0,
+                "best_fitness": self._best["melhor_fitness"] if self._best else None,
+                "best": self._best,
+                "error": self.error,
+            }
+
+    def _run(self, run: Callable[["GAJob"], dict]) -> dict | None:
+        if self._cancelled:
+            self.status = CANCELLED
+            return None
+        self.status = RUNNING
+        try:
+            resultado = run(self)
+        except Exception as e:
+            logging.exception(f"GA job {self.id} failed")
+            self.error = f"{type(e).__name__}: {e}"
+            self.status = FAILED
+            raise
+        if self._cancelled:
+            self.status = CANCELLED
+            return None
+        self.status = DONE
+        return resultado
+
+
+class GAJobManager:
+    """
+    Executa jobs do algoritmo genético em um pool de threads, liberando quem
+    os submete (a thread do script do Streamlit). O modelo de ilhas continua
+    usando processos dentro do job.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ga-job")
+        self.jobs: dict[str, GAJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, run: Callable[[GAJob], dict]) -> GAJob:
+        """
+        Agenda `run(job)`, que deve executar o algoritmo com o job como
+        observador e `job.stop_event` como sinal de parada.
+        """
+        job = GAJob(uuid.uuid4().hex[:12])
+        with self._lock:
+            # Mantém apenas os jobs ainda em andamento e o novo
+            self.jobs = {job_id: antigo for job_id, antigo in self.jobs.items() if not antigo.done()}
+            self.jobs[job.id] = job
+        job._future = self.executor.submit(job._run, run)
+        return job
+
+    def get(self, job_id: str) -> GAJob | None:
+        with self._lock:
+            return self.jobs.get(job_id)
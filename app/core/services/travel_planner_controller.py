@@ -1,25 +1,60 @@
+import json
 import logging
-import folium
+import threading
+import numpy as np
 import pandas as pd
-import streamlit as st
 from datetime import datetime
-from streamlit_folium import st_folium
+from typing import Callable, TYPE_CHECKING
 from core.api.open_api import OpenAi
 from core.utils.file_utils import FileUtils
 from core.utils.date_utils import DateUtils
-from core.utils.request_utils import RequestUtils
+from core.utils.lru_cache import LRUCache
 from core.utils.data_frame_utils import DataFrameUtils
 from core.api.google.routes_api import RoutesClient
+from core.api.estimated_routes_api import EstimatedRoutesClient
 from core.api.google.geocoding_api import GeoCodingClient
 from core.genetic.genetic_algorithm import TravelGeneticAlgorithm
-from streamlit.runtime.uploaded_file_manager import UploadedFile
+from core.genetic.island_model import IslandModelRunner
+from core.genetic.telemetry import GenerationObserver, HistoryRecorder
+from core.services.async_planning_pipeline import AsyncPlanningPipeline
+from core.services.ga_jobs import GAJob, GAJobManager
 
+if TYPE_CHECKING:
+    from streamlit.runtime.uploaded_file_manager import UploadedFile
+
+# Provedores de matriz de deslocamento: "routes" consulta a Google Routes API e
+# "estimate" estima pelas coordenadas (haversine), sem chamadas externas
+MATRIX_PROVIDERS = {
+    "routes": RoutesClient,
+    "estimate": EstimatedRoutesClient,
+}
+
+# Capacidade dos caches do controlador (em entradas)
+MATRIX_CACHE_SIZE = 16
+RESULT_CACHE_SIZE = 32
+POPULATION_CACHE_SIZE = 8
 
 class TravelPlannerController:
+    # Caches endereçados por conteúdo, compartilhados por todas as instâncias
+    # (o Streamlit recria o controlador a cada rerun):
+    # - matrizes: provedor + hash dos locais (nome e coordenadas)
+    # - resultados: hash dos locais + hash das matrizes + parâmetros do algoritmo
+    # - populações: última população por problema (locais, matrizes, datas e
+    #   limite diário), para warm start quando só os parâmetros do algoritmo mudam
+    _matrix_cache = LRUCache(MATRIX_CACHE_SIZE)
+    _result_cache = LRUCache(RESULT_CACHE_SIZE)
+    _population_cache = LRUCache(POPULATION_CACHE_SIZE)
+    _cache_lock = threading.Lock()
+    # Execuções do algoritmo genético em segundo plano (também sobrevivem aos reruns)
+    _job_manager = GAJobManager()
+
     def __init__(self):
         self.file_utils = FileUtils()
         self.date_utils = DateUtils()
         self.dataframe_utils = DataFrameUtils()
+        # Como foi a última execução do algoritmo: cached, warm_start (indivíduos
+        # reaproveitados) e history (estatísticas por geração)
+        self.last_run = None
 
     def handle_text_input(self,
                           destination: str,
@@ -27,50 +62,130 @@ class TravelPlannerController:
                           start_date: datetime,
                           end_date: datetime,
                           temperature: float,
-                          top_p: float) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-        
+                          top_p: float,
+                          matrix_provider: str = "routes",
+                          on_event: Callable[[dict], None] | None = None) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """
+        Fluxo por texto: geocodificação do hotel, sugestão de locais e matriz de
+        deslocamento rodam no pipeline assíncrono. `on_event` recebe os
+        resultados parciais à medida que chegam.
+        """
         trip_days = self.date_utils.get_trip_days(start_date, end_date)
-        geo_client = GeoCodingClient()
-        routes_client = RoutesClient()
-        open_ai = OpenAi(top_p, temperature, destination, trip_days)
-    
-        def fetch_hotel_coordinates():
-            return geo_client.get_coordinates(hotel_name)
+        pipeline = AsyncPlanningPipeline(GeoCodingClient(),
+                                         OpenAi(top_p, temperature, destination, trip_days),
+                                         self._build_routes_client(matrix_provider))
+        return pipeline.run(hotel_name, on_event)
 
-        def fetch_tourist_places():
-            return open_ai.get_places_tourist_points()
-        
-        tasks = [fetch_hotel_coordinates, fetch_tourist_places]
-
-        hotel_coordinates, tourist_places_df = RequestUtils.run_parallel_tasks(tasks)
 
-        tourist_places_df_with_hotel = self.dataframe_utils.concatenate_dataframe(hotel_coordinates,
-                                                                       tourist_places_df,)
-        
-        duration_df, distance_df = routes_client.compute_duration_and_distance(tourist_places_df_with_hotel)
-        
-        return tourist_places_df, duration_df, distance_df, hotel_coordinates
 
-
-
-    def handle_file_upload(self, uploaded_file: UploadedFile, hotel_name: str) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    def handle_file_upload(self,
+                           uploaded_file: "UploadedFile | str",
+                           hotel_name: str,
+                           matrix_provider: str = "routes",
+                           hotel_coordinates: tuple[float, float] | None = None) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
         """
-        Lê o arquivo CSV enviado pelo usuário e transforma em DataFrame.
+        Lê o arquivo CSV enviado pelo usuário (ou um caminho) e transforma em
+        DataFrame. Com `hotel_coordinates` o hotel não é geocodificado.
         """
-        geo_client = GeoCodingClient()
-        routes_client = RoutesClient()
-        hotel_coordinates = geo_client.get_coordinates(hotel_name)
         df_file = self.file_utils.read_csv(uploaded_file)
+        if hotel_coordinates is None:
+            hotel_coordinates = GeoCodingClient().get_coordinates(hotel_name)
         
         tourist_places_df = self.dataframe_utils.concatenate_dataframe(hotel_coordinates,
                                                                        df_file,)
         
-        duration_df, distance_df = routes_client.compute_duration_and_distance(tourist_places_df)
+        duration_df, distance_df = self._compute_matrices(tourist_places_df, matrix_provider)
         
         return tourist_places_df, duration_df, distance_df
 
     
 
+    def update_travel_matrices(self,
+                               df_places: pd.DataFrame,
+                               df_duration: pd.DataFrame,
+                               df_distance: pd.DataFrame,
+                               hotel_coordinates: tuple[float, float] | None,
+                               matrix_provider: str = "routes",
+                               matrix_places: pd.DataFrame | None = None,
+                               matrices_provider: str | None = None) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """
+        Mantém as matrizes alinhadas com os locais editados: locais removidos são
+        descartados e apenas as linhas e colunas dos locais novos são buscadas.
+        Linhas ainda incompletas no editor (sem nome ou coordenadas) são ignoradas.
+
+        `matrix_places` são os locais (nome e coordenadas) para os quais as
+        matrizes foram calculadas; locais cujas coordenadas mudaram têm as suas
+        linhas e colunas buscadas de novo. Retorna as matrizes e os locais
+        correspondentes (o próximo `matrix_places`).
+
+        `matrices_provider` é o provedor que calculou as matrizes atuais. Se for
+        outro (ex.: o rascunho estimado e agora a Routes API), nenhum par é
+        reaproveitado: as matrizes são calculadas de novo por `matrix_provider`.
+
+        Sem linha HOTEL nos locais (fluxo por texto), o hotel em
+        `hotel_coordinates` entra apenas nas matrizes: os locais devolvidos são
+        os recebidos, sem o HOTEL, para que ele não vire um local a visitar.
+        """
+        df_places = self._prepare_places(df_places)
+        locais_matriz = self._with_hotel(df_places, hotel_coordinates)
+        if matrices_provider is not None and matrices_provider != matrix_provider:
+            return *self._compute_matrices(locais_matriz, matrix_provider), df_places
+        if matrix_places is None:
+            if set(locais_matriz["places"]) == set(df_duration.index):
+                return df_duration, df_distance, df_places
+        else:
+            matrix_places = self._with_hotel(matrix_places, hotel_coordinates)
+            if self._matrix_key(locais_matriz, matrix_provider) == self._matrix_key(matrix_places, matrix_provider):
+                return df_duration, df_distance, df_places
+            alterados = self._moved_places(matrix_places, locais_matriz)
+            df_duration = df_duration.drop(index=alterados, columns=alterados, errors="ignore")
+            df_distance = df_distance.drop(index=alterados, columns=alterados, errors="ignore")
+
+        chave = self._matrix_key(locais_matriz, matrix_provider)
+        matrices = self._cache_get(self._matrix_cache, chave)
+        if matrices is None:
+            routes_client = self._build_routes_client(matrix_provider)
+            matrices = routes_client.update_duration_and_distance(locais_matriz, df_duration, df_distance)
+            self._cache_put(self._matrix_cache, chave, matrices)
+        return *matrices, df_places
+
+    def _compute_matrices(self, df_places: pd.DataFrame, matrix_provider: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+        chave = self._matrix_key(df_places, matrix_provider)
+        matrices = self._cache_get(self._matrix_cache, chave)
+        if matrices is None:
+            matrices = self._build_routes_client(matrix_provider).compute_duration_and_distance(df_places)
+            self._cache_put(self._matrix_cache, chave, matrices)
+        return matrices
+
+    @staticmethod
+    def _prepare_places(df_places: pd.DataFrame) -> pd.DataFrame:
+        # Sem linhas incompletas e com índice contínuo: os genes do algoritmo
+        # são posições em `places`
+        return df_places.dropna(subset=["places", "latitude", "longitude"]).reset_index(drop=True)
+
+    def _with_hotel(self,
+                    df_places: pd.DataFrame,
+                    hotel_coordinates: tuple[float, float] | None) -> pd.DataFrame:
+        # Locais usados para calcular as matrizes: a origem de cada dia é o HOTEL
+        if "HOTEL" not in set(df_places["places"]) and hotel_coordinates is not None:
+            return self.dataframe_utils.concatenate_dataframe(hotel_coordinates, df_places)
+        return df_places
+
+    @staticmethod
+    def _moved_places(anteriores: pd.DataFrame, atuais: pd.DataFrame) -> list[str]:
+        # Locais presentes nas duas versões com coordenadas diferentes
+        colunas = ["latitude", "longitude"]
+        anteriores = anteriores.drop_duplicates("places").set_index("places")[colunas]
+        atuais = atuais.drop_duplicates("places").set_index("places")[colunas]
+        comuns = atuais.index.intersection(anteriores.index)
+        return comuns[(atuais.loc[comuns] != anteriores.loc[comuns]).any(axis=1)].tolist()
+
+    @staticmethod
+    def _build_routes_client(matrix_provider: str) -> RoutesClient | EstimatedRoutesClient:
+        if matrix_provider not in MATRIX_PROVIDERS:
+            raise ValueError(f"Invalid matrix provider: {matrix_provider}. Expected one of {list(MATRIX_PROVIDERS)}")
+        return MATRIX_PROVIDERS[matrix_provider]()
+
     def run_genetic_algorithm(self,
                                df_places: pd.DataFrame,
                                df_duration: pd.DataFrame,
@@ -81,9 +196,56 @@ class TravelPlannerController:
                                crossover: float,
                                time_limit: int,
                                start_date: datetime,
-                               end_date: datetime) -> TravelGeneticAlgorithm:
-        
-        ga = TravelGeneticAlgorithm(
+                               end_date: datetime,
+                               fitness_mode: str = "scalar",
+                               islands: int = 1,
+                               local_search_budget_ms: int = 0,
+                               crossover_operator: str = "ox",
+                               time_budget_ms: int = 0,
+                               adaptive: bool = False,
+                               seed_ratio: float = 0.0,
+                               observers: list[GenerationObserver] | None = None,
+                               use_cache: bool = True,
+                               stop_event: threading.Event | None = None) -> dict:
+        """
+        Executa o algoritmo genético (modelo de ilhas quando `islands` > 1).
+
+        Com `use_cache`, uma execução com os mesmos locais, matrizes e parâmetros
+        devolve o resultado guardado, e uma execução do mesmo problema com outros
+        parâmetros começa da última população obtida para ele (warm start).
+        `stop_event` interrompe a execução ao fim da geração atual; o resultado
+        parcial não é guardado no cache.
+        """
+        problema = (self.dataframe_utils.content_hash(df_places),
+                    self.dataframe_utils.content_hash(df_duration, df_distance),
+                    time_limit,
+                    str(start_date),
+                    str(end_date))
+        parametros = json.dumps({
+            "population_size": pop_size,
+            "generations": generations,
+            "mutation_rate": mutation,
+            "crossover_rate": crossover,
+            "fitness_mode": fitness_mode,
+            "islands": islands,
+            "local_search_budget_ms": local_search_budget_ms,
+            "crossover_operator": crossover_operator,
+            "time_budget_ms": time_budget_ms,
+            "adaptive": adaptive,
+            "seed_ratio": seed_ratio,
+        }, sort_keys=True)
+
+        if use_cache:
+            cached = self._cache_get(self._result_cache, problema + (parametros,))
+            if cached is not None:
+                resultado, history = cached
+                self.last_run = {"cached": True, "warm_start": 0, "history": history}
+                logging.info("Resultado do algoritmo genético reaproveitado do cache.")
+                return resultado
+
+        initial_population = self._cache_get(self._population_cache, problema) if use_cache else None
+        recorder = HistoryRecorder()
+        ga_params = dict(
             places=df_places,
             duration = df_duration,
             distance = df_distance,
@@ -94,15 +256,87 @@ class TravelPlannerController:
             time_min_daily=time_limit,
             start_date=start_date,
             end_date=end_date,
+            fitness_mode=fitness_mode,
+            local_search_budget_ms=local_search_budget_ms,
+            crossover_operator=crossover_operator,
+            time_budget_ms=time_budget_ms,
+            adaptive=adaptive,
+            seed_ratio=seed_ratio,
+            observers=[recorder, *(observers or [])],
+            initial_population=initial_population,
+            stop_event=stop_event,
         )
-        return ga.run()
+        if islands > 1:
+            ga = IslandModelRunner(num_islands=islands, **ga_params)
+        else:
+            ga = TravelGeneticAlgorithm(**ga_params)
+        resultado = ga.run()
+
+        self.last_run = {"cached": False, "warm_start": ga.warm_start_size, "history": recorder.history}
+        if use_cache:
+            # O melhor indivíduo vem primeiro para ser preservado no warm start
+            final_population = np.vstack([np.asarray(resultado["melhor_individuo_idx"], dtype=ga.population.dtype),
+                                          ga.population])
+            self._cache_put(self._population_cache, problema, final_population)
+            if stop_event is None or not stop_event.is_set():
+                self._cache_put(self._result_cache, problema + (parametros,), (resultado, recorder.history))
+        return resultado
+
+    def submit_genetic_algorithm(self, *args, observers: list[GenerationObserver] | None = None, **kwargs) -> GAJob:
+        """
+        Executa `run_genetic_algorithm` (mesmos argumentos) em segundo plano.
+        O job devolvido acompanha o progresso por geração e permite cancelar ou
+        aceitar o melhor roteiro atual.
+        """
+        def executar(job: GAJob) -> dict:
+            resultado = self.run_genetic_algorithm(*args,
+                                                   observers=[job, *(observers or [])],
+                                                   stop_event=job.stop_event,
+                                                   **kwargs)
+            job.run_info = self.last_run
+            return resultado
+
+        return self._job_manager.submit(executar)
+
+    @staticmethod
+    def _matrix_key(df_places: pd.DataFrame, matrix_provider: str) -> tuple[str, str]:
+        # As matrizes dependem apenas do nome e das coordenadas dos locais
+        colunas = df_places[["places", "latitude", "longitude"]].reset_index(drop=True)
+        return matrix_provider, DataFrameUtils.content_hash(colunas)
+
+    @classmethod
+    def _cache_get(cls, cache: LRUCache, chave: tuple):
+        with cls._cache_lock:
+            return cache.get(chave)
+
+    @classmethod
+    def _cache_put(cls, cache: LRUCache, chave: tuple, valor) -> None:
+        with cls._cache_lock:
+            cache.put(chave, valor)
 
+    # Streamlit e folium são importados só na renderização: a CLI usa o
+    # controlador sem interface e não paga o custo desses imports.
     def render_result_summary(self, resultado: dict) -> None:
+        import streamlit as st
+
         try:
             st.subheader("📊 Resumo da Execução do Algoritmo Genético")
 
             st.markdown(f"**Melhor Fitness:** `{resultado['melhor_fitness']:.2f}`")
             st.markdown(f"**Gerações Executadas:** `{resultado['geracoes_executadas']}`")
+            if "tempo_ate_melhor_s" in resultado:
+                st.markdown(f"**Tempo até o Melhor:** `{resultado['tempo_ate_melhor_s']:.2f}s` "
+                            f"(geração {resultado['geracao_do_melhor']}, total `{resultado['tempo_total_s']:.2f}s`)")
+
+            cache_fitness = resultado.get('cache_fitness')
+            if cache_fitness:
+                st.markdown(f"**Cache de Fitness:** `{cache_fitness['hits']}` acertos / "
+                            f"`{cache_fitness['misses']}` falhas ({cache_fitness['hit_rate']:.0%})")
+
+            cache_segmentos = resultado.get('cache_segmentos')
+            if cache_segmentos:
+                st.markdown(f"**Cache de Dias (sub-rotas):** `{cache_segmentos['hits']}` acertos / "
+                            f"`{cache_segmentos['misses']}` falhas ({cache_segmentos['hit_rate']:.0%})")
 
             st.markdown("**Ordem dos Locais (índices):**")
             st.code(resultado['melhor_individuo_idx'], language="python")
@@ -115,7 +349,34 @@ class TravelPlannerController:
             logging.exception("Erro ao exibir resumo:", exc_info=e)
 
 
+    def render_convergence_chart(self, history: list[dict]) -> None:
+        """
+        Gráfico de convergência (melhor e média do fitness pelo tempo de
+        execução) e tempo total gasto em cada fase do algoritmo genético.
+        """
+        import streamlit as st
+
+        try:
+            if not history:
+                return
+            st.subheader("📈 Convergência do Algoritmo Genético")
+
+            df_history = pd.DataFrame(history)
+            st.line_chart(df_history.set_index("elapsed_s")[["best_fitness", "mean_fitness"]])
+
+            timings = pd.DataFrame(list(df_history["timings_ms"])).sum()
+            st.markdown("**Tempo por fase (ms):**")
+            st.bar_chart(timings[timings > 0])
+
+        except Exception as e:
+            st.error("Erro ao exibir o gráfico de convergência.")
+            logging.exception("Erro ao exibir convergência:", exc_info=e)
+
     def render_daily_maps(self, roteiro_por_dia: dict, hotel_coords: tuple[float, float]) -> None:
+        import folium
+        import streamlit as st
+        from streamlit_folium import st_folium
+
         try:
             st.subheader("📍 Mapas dos Roteiros por Dia")
 
@@ -1,3 +1,4 @@
+import hashlib
 import pandas as pd
 
 class DataFrameUtils:
@@ -22,3 +23,15 @@ class DataFrameUtils:
         }])
         
         return pd.concat([hotel_df, tourist_places_df], ignore_index=True)
+
+    @staticmethod
+    def content_hash(*frames: pd.DataFrame) -> str:
+        """
+        Hash do conteúdo (colunas, índice e valores) dos DataFrames, usado como
+        chave de cache: DataFrames iguais têm o mesmo hash em qualquer rerun.
+        """
+        digest = hashlib.sha1()
+        for df in frames:
+            digest.update("\x1f".join(map(str, df.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        return digest.hexdigest()
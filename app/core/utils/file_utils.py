@@ -1,13 +1,39 @@
+import re
 import logging
+import numpy as np
 import pandas as pd
 from io import StringIO
-from pydantic import ValidationError
+from typing import TYPE_CHECKING
 from core.model.files_schema import FileSchema
-from streamlit.runtime.uploaded_file_manager import UploadedFile
-  
+
+if TYPE_CHECKING:
+    # Apenas para anotação: importar o Streamlit domina o tempo de inicialização da CLI
+    from streamlit.runtime.uploaded_file_manager import UploadedFile
+
+WEEKDAY_COLUMNS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+MINUTES_PER_DAY = 24 * 60
+_TIME = r"(?:[01]?\d|2[0-3]):[0-5]\d"
+_INTERVAL = rf"{_TIME}\s*-\s*{_TIME}"
+OPENING_HOURS_PATTERN = re.compile(rf"\s*(?:(?i:closed|open 24 hours)|{_INTERVAL}(?:\s*,\s*{_INTERVAL})*)\s*")
+
+
+class SchemaValidationError(ValueError):
+    """
+    Erro de validação com todas as linhas inválidas. `errors` tem um dict por
+    problema: row, column, value e message.
+    """
+
+    def __init__(self, errors: list[dict]):
+        self.errors = errors
+        rows = sorted({error["row"] for error in errors})
+        details = "\n".join(f"row {error['row']}, {error['column']}={error['value']!r}: {error['message']}"
+                            for error in errors)
+        super().__init__(f"Validation errors in {len(rows)} rows:\n{details}")
+
+
 class FileUtils:
     @staticmethod
-    def read_csv(uploaded_file: UploadedFile) -> pd.DataFrame:
+    def read_csv(uploaded_file: "UploadedFile | str") -> pd.DataFrame:
         try:
             df = pd.read_csv(uploaded_file)
             FileUtils._validate_schema(df)
@@ -18,16 +44,70 @@ class FileUtils:
 
     @staticmethod
     def _validate_schema(df: pd.DataFrame) -> None:
-        required = {"places","latitude","longitude","mon","tue","wed","thu","fri","sat","sun","estimated_duration_min","priority"}
+        """
+        Valida o DataFrame inteiro com operações por coluna: tipos, faixas de
+        latitude/longitude, formato dos horários (mon–sun), duração e
+        prioridade. Todas as linhas inválidas são reportadas de uma vez.
+
+        :raises ValueError: Se faltar alguma coluna.
+        :raises SchemaValidationError: Se houver linhas inválidas.
+        """
+        required = set(FileSchema.model_fields)
         missing = required - set(df.columns)
         if missing:
             raise ValueError(f"Missing columns: {missing}")
-        
-        for i, row in df.iterrows():
-            try:
-                FileSchema(**row.to_dict())
-            except ValidationError as e:
-                raise ValueError(f"Validation error in row {i}: {e}")
+
+        checks = {
+            "places": (FileUtils._is_non_empty_text(df["places"]),
+                       "must be a non-empty text"),
+            "latitude": (pd.to_numeric(df["latitude"], errors="coerce").between(-90, 90),
+                         "must be a number between -90 and 90"),
+            "longitude": (pd.to_numeric(df["longitude"], errors="coerce").between(-180, 180),
+                          "must be a number between -180 and 180"),
+            "estimated_duration_min": (FileUtils._is_integer(df["estimated_duration_min"], 0, MINUTES_PER_DAY),
+                                       f"must be an integer between 0 and {MINUTES_PER_DAY}"),
+            "priority": (FileUtils._is_integer(df["priority"], 0, 1),
+                         "must be 0 or 1"),
+        }
+        for day in WEEKDAY_COLUMNS:
+            checks[day] = (FileUtils._check_values(df[day], FileUtils._is_opening_hours),
+                           "must be 'Closed', 'Open 24 hours' or opening hours like 09:00-18:00 (or 09:00-12:00,14:00-18:00)")
+
+        errors = []
+        for column, (valid, message) in checks.items():
+            invalid = ~np.asarray(valid.fillna(False) if isinstance(valid, pd.Series) else valid, dtype=bool)
+            if not invalid.any():
+                continue
+            errors.extend({"row": row, "column": column, "value": value, "message": message}
+                          for row, value in df.loc[invalid, column].items())
+        if errors:
+            raise SchemaValidationError(sorted(errors, key=lambda error: error["row"]))
+
+    @staticmethod
+    def _check_values(series: pd.Series, predicate) -> np.ndarray:
+        """
+        Aplica `predicate` uma vez por valor distinto (catálogos repetem muito
+        os mesmos horários) e espalha o resultado para todas as linhas.
+        """
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        valid = np.fromiter((predicate(value) for value in uniques), dtype=bool, count=len(uniques))
+        # Valores ausentes recebem o código -1, que aponta para o False do final
+        return np.append(valid, False)[codes]
+
+    @staticmethod
+    def _is_non_empty_text(series: pd.Series) -> np.ndarray:
+        if pd.api.types.infer_dtype(series, skipna=False) != "string":
+            return FileUtils._check_values(series, lambda value: isinstance(value, str) and value.strip() != "")
+        return np.char.str_len(np.char.strip(series.to_numpy(dtype=str))) > 0
+
+    @staticmethod
+    def _is_opening_hours(value) -> bool:
+        return isinstance(value, str) and OPENING_HOURS_PATTERN.fullmatch(value) is not None
+
+    @staticmethod
+    def _is_integer(series: pd.Series, minimum: int, maximum: int) -> pd.Series:
+        values = pd.to_numeric(series, errors="coerce")
+        return values.between(minimum, maximum) & (values % 1 == 0)
 
     @staticmethod
     def from_string(csv_string: str) -> pd.DataFrame:
@@ -1,4 +1,6 @@
 import math
+import numpy as np
+import pandas as pd
 
 
 class GeoUtils:
@@ -14,4 +16,40 @@ class GeoUtils:
     @staticmethod
     def estimated_travel_minutes(lat1, lon1, lat2, lon2, speed_kmh=30):
         distance_km = GeoUtils.haversine_km(lat1, lon1, lat2, lon2)
-        return (distance_km / speed_kmh) * 60
\ No newline at end of file
+        return (distance_km / speed_kmh) * 60
+
+    @staticmethod
+    def haversine_matrix_km(latitudes, longitudes) -> np.ndarray:
+        """
+        Distância de grande círculo entre todos os pares de pontos (matriz NxN, em km).
+        """
+        R = 6371
+        phi = np.radians(np.asarray(latitudes, dtype=float))
+        lam = np.radians(np.asarray(longitudes, dtype=float))
+        dphi = phi[None, :] - phi[:, None]
+        dlambda = lam[None, :] - lam[:, None]
+        a = np.sin(dphi / 2)**2 + np.cos(phi)[:, None] * np.cos(phi)[None, :] * np.sin(dlambda / 2)**2
+        return 2 * R * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+    @staticmethod
+    def find_suspicious_coordinates(latitudes,
+                                    longitudes,
+                                    max_distance_km: float,
+                                    center: tuple[float, float] | None = None) -> np.ndarray:
+        """
+        Marca coordenadas inválidas (ausentes, fora da faixa ou (0, 0)) e as que
+        estão a mais de `max_distance_km` de `center` (por padrão, o ponto
+        mediano das coordenadas válidas).
+        """
+        lat = pd.to_numeric(pd.Series(latitudes), errors="coerce").to_numpy(dtype=float)
+        lng = pd.to_numeric(pd.Series(longitudes), errors="coerce").to_numpy(dtype=float)
+        invalid = (np.isnan(lat) | np.isnan(lng) | (np.abs(lat) > 90) | (np.abs(lng) > 180)
+                   | ((lat == 0) & (lng == 0)))
+        if center is None:
+            if invalid.all():
+                return invalid
+            center = (np.median(lat[~invalid]), np.median(lng[~invalid]))
+
+        center_lat, center_lng = center
+        distance = GeoUtils.haversine_matrix_km(np.append(center_lat, lat), np.append(center_lng, lng))[0, 1:]
+        return invalid | (distance > max_distance_km)
@@ -0,0 +1,108 @@
+import os
+import json
+import time
+import atexit
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Any, Iterable
+
+DEFAULT_CACHE_PATH = os.getenv("TRAVEL_PLANNER_CACHE_PATH", os.path.join(".cache", "travel_planner.sqlite"))
+
+# SQLite limita o número de parâmetros por consulta
+_SQLITE_BATCH = 500
+
+# Tabelas (arquivo, namespace) cujas entradas expiradas já foram removidas neste processo
+_purged: set[tuple[str, str]] = set()
+_purged_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _shared_connection(path: str) -> tuple[sqlite3.Connection, threading.Lock]:
+    """
+    One connection (and the lock that serializes it) per database file, shared
+    by every cache of the process and closed at interpreter exit.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path, check_same_thread=False)
+    atexit.register(connection.close)
+    return connection, threading.Lock()
+
+
+class PersistentCache:
+    """
+    Key-value cache persisted in SQLite, with per-entry expiry (TTL).
+
+    Values are stored as JSON. Each namespace gets its own table, so different
+    clients can share the same database file; caches on the same file share
+    one connection. Expired entries are purged the first time a namespace is
+    opened in the process.
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: int, path: str = DEFAULT_CACHE_PATH):
+        if not namespace.isidentifier():
+            raise ValueError(f"Invalid cache namespace: {namespace}")
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self._connection, self._lock = _shared_connection(os.path.abspath(path))
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {namespace} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+        with _purged_lock:
+            first_open = (os.path.abspath(path), namespace) not in _purged
+            _purged.add((os.path.abspath(path), namespace))
+        if first_open:
+            self.purge_expired()
+
+    def get(self, key: str) -> Any | None:
+        """
+        Returns the cached value for `key`, or None if missing or expired.
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """
+        Returns a dict with the keys found (and not expired) and their values.
+        """
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _SQLITE_BATCH):
+                batch = keys[start:start + _SQLITE_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._connection.execute(
+                    f"SELECT key, value FROM {self.namespace} WHERE key IN ({placeholders}) AND expires_at > ?",
+                    (*batch, now),
+                ).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+        return found
+
+    def set(self, key: str, value: Any) -> None:
+        self.set_many({key: value})
+
+    def set_many(self, items: dict[str, Any]) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        rows = [(key, json.dumps(value), expires_at) for key, value in items.items()]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO {self.namespace} (key, value, expires_at) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def purge_expired(self) -> int:
+        """
+        Deletes expired entries and returns how many were removed.
+        """
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                f"DELETE FROM {self.namespace} WHERE expires_at <= ?", (time.time(),)
+            )
+        return cursor.rowcount
@@ -0,0 +1,30 @@
+import time
+import asyncio
+import threading
+
+
+class RateLimiter:
+    """
+    Limita a taxa de chamadas (requisições por segundo) entre threads e
+    corrotinas. Cada chamada reserva o próximo intervalo livre e espera até ele.
+    """
+
+    def __init__(self, requests_per_second: float):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        self.interval = 1 / requests_per_second
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        time.sleep(self._reserve())
+
+    async def wait_async(self) -> None:
+        await asyncio.sleep(self._reserve())
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        return slot - now
@@ -1,5 +1,11 @@
+import requests
 from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, List, Any
+from urllib3.util.retry import Retry
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+RETRY_BACKOFF_SECONDS = 0.5
 
 class RequestUtils:
     @staticmethod
@@ -14,3 +20,25 @@ class RequestUtils:
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             futures = [executor.submit(func) for func in task_funcs]
             return [f.result() for f in futures]
+
+    @staticmethod
+    def build_session(pool_size: int, max_retries: int, allowed_methods: List[str]) -> requests.Session:
+        """
+        Cria uma sessão HTTP com pool de conexões e novas tentativas (backoff
+        exponencial) para respostas 429/5xx.
+
+        :param pool_size: Número máximo de conexões mantidas no pool.
+        :param max_retries: Número máximo de novas tentativas por requisição.
+        :param allowed_methods: Métodos HTTP que podem ser repetidos.
+        """
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=RETRY_BACKOFF_SECONDS,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=allowed_methods,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
@@ -1,3 +1,7 @@
+# Último minuto do dia, usado como fim dos locais abertos 24 horas ("00:00-23:59")
+FIM_DO_DIA = 24 * 60 - 1
+
+
 class TimeUtils:
     @staticmethod
     def parse_time_range(time_str):
@@ -6,4 +10,31 @@ class TimeUtils:
             h1, m1 = map(int, start.split(':'))
             h2, m2 = map(int, end.split(':'))
             return h1 * 60 + m1, h2 * 60 + m2
-        return None, None
\ No newline at end of file
+        return None, None
+
+    @staticmethod
+    def parse_opening_hours(value) -> list[tuple[int, int]]:
+        """
+        Converte o horário de funcionamento de um dia em uma lista de
+        intervalos (início, fim) em minutos.
+
+        Aceita "Closed" (ou vazio), "Open 24 hours" e um ou mais intervalos
+        separados por vírgula, como "09:00-12:00,14:00-18:00". Intervalos que
+        passam da meia-noite terminam em 23:59; trechos inválidos são ignorados.
+        """
+        if not isinstance(value, str):
+            return []
+        texto = value.strip().casefold()
+        if texto == "open 24 hours":
+            return [(0, FIM_DO_DIA)]
+
+        intervalos = []
+        for trecho in texto.split(','):
+            try:
+                inicio, fim = TimeUtils.parse_time_range(trecho.strip())
+            except ValueError:
+                continue
+            if inicio is None:
+                continue
+            intervalos.append((inicio, fim if fim >= inicio else FIM_DO_DIA))
+        return intervalos
@@ -1,9 +1,11 @@
+import os
 import logging
 import streamlit as st
 from datetime import date
 from core.utils.file_utils import FileUtils
 from core.utils.date_utils import DateUtils
 from core.services.travel_planner_controller import TravelPlannerController
+from core.genetic.genetic_algorithm import FITNESS_EVALUATORS, EXPERIMENTAL_FITNESS_MODES
 
 class TravelApp:
     def __init__(self):
@@ -21,6 +23,17 @@ class TravelApp:
             pop_size = st.slider("Population Size", 10, 200, 50, 10)
             mutation = st.slider("Mutation Rate", 0.0, 1.0, 0.1, 0.01, "%.2f")
             crossover = st.slider("Crossover Rate", 0.0, 1.0, 0.8, 0.5, "%.2f")
+            crossover_operator = st.selectbox("Crossover Operator", ["ox", "pmx", "erx"])
+            fitness_mode = st.selectbox("Fitness Evaluation",
+                                        [m for m in FITNESS_EVALUATORS if m not in EXPERIMENTAL_FITNESS_MODES],
+                                        help="scalar is the fastest for typical trips (~70 places). "
+                                             "batch gives the same result vectorized over the population; "
+                                             "it is slightly slower at this size and only pays off with large populations.")
+            islands = st.slider("Islands (parallel populations)", 1, max(os.cpu_count() or 1, 2), 1, 1)
+            local_search_ms = st.slider("Local Search Budget (ms)", 0, 2000, 0, 100)
+            time_budget_ms = st.slider("Time Budget (ms, 0 = no limit)", 0, 30000, 0, 100)
+            adaptive = st.checkbox("Adaptive rates and stopping", value=False)
+            seed_ratio = st.slider("Heuristic Seeding (share of population)", 0.0, 0.5, 0.0, 0.05, "%.2f")
 
         with st.sidebar.expander("🧪 OpenAi Settings", expanded=True):
             temperature = st.slider("Temperature Rate", 0.0, 2.0, 1.0, 0.1)
@@ -30,13 +43,66 @@ class TravelApp:
             start_date = st.date_input("Start Date", date.today(), format="DD/MM/YYYY")
             end_date = st.date_input("End Date", start_date, format="DD/MM/YYYY")
             time_limit = st.slider("Time Limit per Day (minutes)", 60, 1440, 240, 30)
+            quick_draft = st.checkbox("Quick draft (estimated travel times)", value=False)
+            matrix_provider = "estimate" if quick_draft else "routes"
 
-        return generations, pop_size, mutation, crossover, start_date, end_date, time_limit, temperature, top_p
+        return generations, pop_size, mutation, crossover, crossover_operator, fitness_mode, islands, local_search_ms, time_budget_ms, adaptive, seed_ratio, start_date, end_date, time_limit, temperature, top_p, matrix_provider
+
+    @staticmethod
+    def _render_planning_event(event: dict) -> None:
+        if event["type"] == "places":
+            st.write(f"Suggested: {', '.join(event['data']['places'])}")
+        elif event["type"] == "hotel":
+            st.write(f"Hotel located at {event['data']}")
+        elif event["type"] == "matrix_tile":
+            st.write(f"Travel matrix: {event['fetched']} routes fetched")
+
+    @st.fragment(run_every=1.0)
+    def _render_job_progress(self) -> None:
+        """
+        Acompanha o job do algoritmo genético em segundo plano: redesenha o
+        gráfico de convergência e o mapa do melhor roteiro a cada segundo e,
+        ao terminar, guarda o resultado e recarrega a página.
+        """
+        job = st.session_state.get("ga_job")
+        if job is None:
+            return
+
+        if job.done():
+            st.session_state.ga_job = None
+            if job.status == "failed":
+                st.session_state.ga_notice = ("error", f"Optimization failed: {job.error}")
+            elif job.status == "done":
+                st.session_state.optimized_route = job.result()
+                st.session_state.convergence = job.run_info.get("history", job.history)
+                if job.run_info.get("cached"):
+                    st.session_state.ga_notice = ("info", "Same places, travel matrices and settings: reusing the cached result.")
+                elif job.run_info.get("warm_start"):
+                    st.session_state.ga_notice = ("info", f"Warm start: {job.run_info['warm_start']} individuals reused from the previous run.")
+            elif job.status == "cancelled":
+                st.session_state.ga_notice = ("warning", "Optimization cancelled.")
+            st.rerun()
+
+        progress = job.progress()
+        st.subheader("⏳ Running Genetic Algorithm...")
+        best_fitness = f"{progress['best_fitness']:.2f}" if progress["best_fitness"] is not None else "-"
+        st.write(f"Generation {progress['generations']} · best fitness {best_fitness} · {progress['elapsed_s']:.1f}s")
+
+        accept_col, cancel_col = st.columns(2)
+        if accept_col.button("Accept current best", disabled=progress["best"] is None):
+            job.accept_current_best()
+        if cancel_col.button("Cancel"):
+            job.cancel()
+
+        self.controller.render_convergence_chart(job.history)
+        if progress["best"] is not None:
+            self.controller.render_daily_maps(roteiro_por_dia=progress["best"]["roteiro_por_dia"],
+                                              hotel_coords=st.session_state.get("hotel_coordinates"))
 
     def run(self):
         try:
             st.title("🗺️ Travel Route Optimizer with Genetic Algorithm")
-            generations, pop_size, mutation, crossover, start_date, end_date, time_limit, temperature, top_p = self.render_sidebar()
+            generations, pop_size, mutation, crossover, crossover_operator, fitness_mode, islands, local_search_ms, time_budget_ms, adaptive, seed_ratio, start_date, end_date, time_limit, temperature, top_p, matrix_provider = self.render_sidebar()
             input_type = st.selectbox("How do you want to search??", ["Select", "File", "Text"])
 
             if input_type == "Text":
@@ -46,15 +112,21 @@ class TravelApp:
                     destination = st.text_input("Destination", placeholder="e.g., Paris, France", key="destination_text")
                     submitted = st.form_submit_button("Submit")
                 if submitted and destination:
-                    st.session_state.df,\
-                    st.session_state.df_duration,\
-                    st.session_state.df_distance,\
-                    st.session_state.hotel_coordinates = self.controller.handle_text_input(destination,
-                                                                                     hotel_name,
-                                                                                     start_date,
-                                                                                     end_date,
-                                                                                     temperature,
-                                                                                     top_p)
+                    with st.status("Planning trip...", expanded=False) as status:
+                        st.session_state.df,\
+                        st.session_state.df_duration,\
+                        st.session_state.df_distance,\
+                        st.session_state.hotel_coordinates = self.controller.handle_text_input(destination,
+                                                                                         hotel_name,
+                                                                                         start_date,
+                                                                                         end_date,
+                                                                                         temperature,
+                                                                                         top_p,
+                                                                                         matrix_provider,
+                                                                                         self._render_planning_event)
+                        st.session_state.matrix_places = st.session_state.df
+                        st.session_state.matrices_provider = matrix_provider
+                        status.update(label="Trip data ready", state="complete")
                 elif submitted and destination == "":
                     st.warning("Por favor, preencha o campo de destino antes de continuar.")
 
@@ -74,7 +146,11 @@ class TravelApp:
                         try:
                             st.session_state.df,\
                             st.session_state.df_duration,\
-                            st.session_state.df_distance = self.controller.handle_file_upload(uploaded_file, hotel_name)
+                            st.session_state.df_distance = self.controller.handle_file_upload(uploaded_file,
+                                                                                                  hotel_name,
+                                                                                                  matrix_provider)
+                            st.session_state.matrix_places = st.session_state.df
+                            st.session_state.matrices_provider = matrix_provider
                         except Exception as e:
                             st.error(f"Erro ao ler o arquivo: {e}")
                     elif submitted and uploaded_file is None:
@@ -91,28 +167,59 @@ class TravelApp:
                     use_container_width=True,
                     key="tourist_editor"
                 )
+                # `matrix_places`: locais (sem linhas incompletas e com índice contínuo)
+                # para os quais as matrizes foram calculadas; é o que vai para o algoritmo.
+                # `matrices_provider`: provedor das matrizes atuais (trocar o provedor,
+                # ex.: desmarcar o rascunho rápido, recalcula as matrizes inteiras)
+                st.session_state.df_duration,\
+                st.session_state.df_distance,\
+                st.session_state.matrix_places = self.controller.update_travel_matrices(st.session_state.df,
+                                                                                        st.session_state.df_duration,
+                                                                                        st.session_state.df_distance,
+                                                                                        st.session_state.get("hotel_coordinates"),
+                                                                                        matrix_provider,
+                                                                                        st.session_state.get("matrix_places"),
+                                                                                        st.session_state.get("matrices_provider"))
+                st.session_state.matrices_provider = matrix_provider
                 
             if st.button("Run Optimization"):
                 if "df" in st.session_state and st.session_state.df is not None and not st.session_state.df.empty:
-                    with st.spinner("Running Genetic Algorithm for each day..."):
-                        travel_planner = self.controller.run_genetic_algorithm(
-                            st.session_state.df,
-                            st.session_state.df_duration,
-                            st.session_state.df_distance,
-                            pop_size,
-                            generations,
-                            mutation,
-                            crossover,
-                            time_limit,
-                            start_date,
-                            end_date,
-                        )
-                        st.session_state.optimized_route = travel_planner
+                    job = st.session_state.get("ga_job")
+                    if job is not None and not job.done():
+                        job.cancel()
+                    st.session_state.ga_job = self.controller.submit_genetic_algorithm(
+                        st.session_state.matrix_places,
+                        st.session_state.df_duration,
+                        st.session_state.df_distance,
+                        pop_size,
+                        generations,
+                        mutation,
+                        crossover,
+                        time_limit,
+                        start_date,
+                        end_date,
+                        fitness_mode,
+                        islands,
+                        local_search_ms,
+                        crossover_operator,
+                        time_budget_ms,
+                        adaptive,
+                        seed_ratio,
+                    )
                 else:
                     st.error("No data available for optimization. Please upload a file or enter a valid destination.")
+
+            if st.session_state.get("ga_job") is not None:
+                self._render_job_progress()
+
+            notice = st.session_state.pop("ga_notice", None)
+            if notice is not None:
+                level, message = notice
+                getattr(st, level)(message)
             
             if "optimized_route" in st.session_state:
                 self.controller.render_result_summary(st.session_state.optimized_route)
+                self.controller.render_convergence_chart(st.session_state.get("convergence", []))
                 
                 #hotel_row = st.session_state.df[st.session_state.df["places"] == "HOTEL"].iloc[0]
                 #hotel_coords = (float(hotel_row["latitude"]), float(hotel_row["longitude"]))
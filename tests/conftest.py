@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# O código da aplicação importa a partir de app/ (ex.: `from core.genetic ...`)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
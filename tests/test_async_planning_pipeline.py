@@ -0,0 +1,101 @@
+import json
+import httpx
+import asyncio
+import pytest
+from types import SimpleNamespace
+from core.api.open_api import OpenAi
+from core.api.google.routes_api import RoutesClient
+from core.api.google.geocoding_api import GeoCodingClient
+from core.services.async_planning_pipeline import AsyncPlanningPipeline
+
+HOTEL = (35.0142, 135.7482)
+CSV = """places,latitude,longitude,mon,tue,wed,thu,fri,sat,sun,estimated_duration_min,priority
+Fushimi Inari,34.9671,135.7727,00:00-23:59,00:00-23:59,00:00-23:59,00:00-23:59,00:00-23:59,00:00-23:59,00:00-23:59,120,1
+Kinkaku-ji,35.0394,135.7292,09:00-17:00,09:00-17:00,09:00-17:00,09:00-17:00,09:00-17:00,09:00-17:00,09:00-17:00,60,1
+Gion,35.0037,135.7788,00:00-23:59,00:00-23:59,00:00-23:59,00:00-23:59,00:00-23:59,00:00-23:59,00:00-23:59,60,0
+Nijo Castle,35.0142,135.7481,08:45-16:00,Closed,08:45-16:00,08:45-16:00,08:45-16:00,08:45-16:00,08:45-16:00,90,0
+"""
+
+
+class FakeCompletions:
+    # Resposta da OpenAI em streaming, em pedaços de poucos caracteres
+    async def create(self, stream=False, **kwargs):
+        async def chunks():
+            for inicio in range(0, len(CSV), 7):
+                await asyncio.sleep(0)
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=CSV[inicio:inicio + 7]))])
+
+        return chunks()
+
+
+class FakeGoogle:
+    """
+    Geocoding e computeRouteMatrix falsos. O hotel só é geocodificado depois
+    que um bloco da matriz entre locais foi pedido (ou após um tempo limite).
+    """
+
+    def __init__(self):
+        self.hotel_pedido = None
+        self.eventos = []
+        self.pares = []
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        if "geocode" in str(request.url):
+            self.eventos.append("hotel_requested")
+            if self.hotel_pedido is None:
+                self.hotel_pedido = asyncio.Event()
+            try:
+                await asyncio.wait_for(self.hotel_pedido.wait(), timeout=1)
+            except asyncio.TimeoutError:
+                pass
+            self.eventos.append("hotel_geocoded")
+            return httpx.Response(200, json={"status": "OK", "results": [
+                {"geometry": {"location": {"lat": HOTEL[0], "lng": HOTEL[1]}}}]})
+
+        body = json.loads(request.content)
+        ponto = lambda w: tuple(w["waypoint"]["location"]["latLng"].values())
+        origens = [ponto(w) for w in body["origins"]]
+        destinos = [ponto(w) for w in body["destinations"]]
+        self.pares.extend((o, d) for o in origens for d in destinos)
+        if HOTEL not in origens and HOTEL not in destinos:
+            self.eventos.append("places_tile")
+            if self.hotel_pedido is not None:
+                self.hotel_pedido.set()
+        return httpx.Response(200, json=[
+            {"originIndex": i, "destinationIndex": j, "condition": "ROUTE_EXISTS",
+             "duration": "600s", "distanceMeters": 800}
+            for i in range(len(origens)) for j in range(len(destinos))
+        ])
+
+
+@pytest.fixture
+def google(monkeypatch):
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    fake = FakeGoogle()
+    async_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient",
+                        lambda **kwargs: async_client(transport=httpx.MockTransport(fake.handler), **kwargs))
+    return fake
+
+
+def test_place_tiles_do_not_wait_for_the_hotel(google):
+    open_ai = OpenAi(1.0, 0.7, "Kyoto", 2, use_cache=False)
+    open_ai.async_client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions()))
+    pipeline = AsyncPlanningPipeline(GeoCodingClient(use_cache=False), open_ai,
+                                     RoutesClient(use_cache=False, fill_missing=False))
+    eventos = []
+
+    places, duration, distance, hotel = pipeline.run("Hotel Kyoto", lambda event: eventos.append(event["type"]))
+
+    assert hotel == HOTEL
+    # Um bloco entre locais foi pedido enquanto o hotel ainda era geocodificado
+    assert google.eventos.index("places_tile") < google.eventos.index("hotel_geocoded")
+    assert list(duration.index) == ["HOTEL", *places["places"]]
+    assert eventos[-1] == "done" and "hotel" in eventos
+
+    # Todos os pares, exceto HOTEL -> HOTEL, pedidos uma única vez
+    n = len(places) + 1
+    assert len(google.pares) == len(set(google.pares)) == n * n - 1
+    sem_diagonal_do_hotel = duration.to_numpy().ravel()[1:]
+    assert (sem_diagonal_do_hotel == 10).all()
@@ -0,0 +1,17 @@
+import json
+import pytest
+import cli
+
+
+def test_experimental_fitness_mode_requires_flag(tmp_path, monkeypatch):
+    specs = tmp_path / "trips.jsonl"
+    specs.write_text(json.dumps({"id": "osaka", "places_csv": "osaka.csv", "start_date": "2025-10-06",
+                                 "ga": {"fitness_mode": "segment"}}) + "\n")
+    with pytest.raises(SystemExit) as erro:
+        cli.main([str(specs)])
+    assert erro.value.code == 2
+
+    lote = []
+    monkeypatch.setattr(cli, "run_batch", lambda specs, *args: lote.extend(specs) or 0)
+    assert cli.main([str(specs), "--experimental"]) == 0
+    assert [spec["id"] for spec in lote] == ["osaka"]
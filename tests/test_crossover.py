@@ -0,0 +1,72 @@
+import random
+import numpy as np
+import pytest
+from core.genetic.crossover import (CROSSOVER_OPERATORS, order_crossover_into, partially_mapped_crossover,
+                                    edge_recombination_crossover)
+
+TAMANHOS = [1, 2, 3, 10, 57]
+
+
+def _pais(tamanho: int, rng: random.Random) -> tuple[list[int], list[int]]:
+    return rng.sample(range(tamanho), tamanho), rng.sample(range(tamanho), tamanho)
+
+
+def _cortes(tamanho: int, rng: random.Random) -> list[tuple[int, int]]:
+    # Segmento de um gene (a == b), o indivíduo inteiro e cortes aleatórios
+    cortes = [(0, tamanho - 1), (0, 0), (tamanho - 1, tamanho - 1)]
+    for _ in range(20):
+        a = rng.randrange(tamanho)
+        cortes.append((a, a))
+        cortes.append(tuple(sorted(rng.sample(range(tamanho), 2))) if tamanho > 1 else (0, 0))
+    return cortes
+
+
+def _e_permutacao(filho, tamanho: int) -> bool:
+    return sorted(int(gene) for gene in filho) == list(range(tamanho))
+
+
+@pytest.mark.parametrize("tamanho", TAMANHOS)
+def test_ox_returns_permutations(tamanho):
+    rng = random.Random(tamanho)
+    mascara = np.zeros(tamanho, dtype=bool)
+    for _ in range(10):
+        pai1, pai2 = _pais(tamanho, rng)
+        for a, b in _cortes(tamanho, rng):
+            filho = np.empty(tamanho, dtype=np.int64)
+            order_crossover_into(np.array(pai1), np.array(pai2), a, b, filho, mascara)
+            assert _e_permutacao(filho, tamanho)
+            assert filho[a:b + 1].tolist() == pai1[a:b + 1]
+            assert not mascara.any()
+
+
+@pytest.mark.parametrize("tamanho", TAMANHOS)
+def test_pmx_returns_permutations(tamanho):
+    rng = random.Random(tamanho)
+    for _ in range(10):
+        pai1, pai2 = _pais(tamanho, rng)
+        for a, b in _cortes(tamanho, rng):
+            filho = partially_mapped_crossover(pai1, pai2, a, b)
+            assert _e_permutacao(filho, tamanho)
+            assert filho[a:b + 1] == pai1[a:b + 1]
+
+
+@pytest.mark.parametrize("tamanho", TAMANHOS)
+def test_erx_returns_permutations(tamanho):
+    rng = random.Random(tamanho)
+    random.seed(tamanho)
+    for _ in range(50):
+        pai1, pai2 = _pais(tamanho, rng)
+        assert _e_permutacao(edge_recombination_crossover(pai1, pai2), tamanho)
+
+
+@pytest.mark.parametrize("operador", list(CROSSOVER_OPERATORS))
+@pytest.mark.parametrize("tamanho", [2, 3, 10, 57])
+def test_registered_operators_write_two_permutations(operador, tamanho):
+    rng = random.Random(tamanho)
+    random.seed(tamanho)
+    mascara = np.zeros(tamanho, dtype=bool)
+    for _ in range(50):
+        pai1, pai2 = (np.array(pai) for pai in _pais(tamanho, rng))
+        filho1, filho2 = np.empty(tamanho, dtype=np.int64), np.empty(tamanho, dtype=np.int64)
+        CROSSOVER_OPERATORS[operador](pai1, pai2, filho1, filho2, mascara)
+        assert _e_permutacao(filho1, tamanho) and _e_permutacao(filho2, tamanho)
@@ -0,0 +1,83 @@
+import random
+import numpy as np
+import pytest
+from datetime import timedelta
+from benchmarks.synthetic import make_problem, trip_dates
+from core.genetic.compiled_problem import CompiledProblem
+from core.genetic.crossover import CROSSOVER_OPERATORS
+from core.genetic.fitness import (FitnessEvaluator, BatchFitnessEvaluator, IncrementalFitnessEvaluator,
+                                  SegmentFitnessEvaluator)
+
+TAMANHO = 70
+
+
+@pytest.fixture(scope="module", params=["viagem_inteira", "viagem_curta"])
+def problem(request):
+    places, duration, _ = make_problem(TAMANHO, seed=3)
+    start_date, end_date = trip_dates(TAMANHO)
+    if request.param == "viagem_curta":
+        # Dois dias: a maior parte dos genes fica fora do roteiro
+        end_date = start_date + timedelta(days=1)
+    return CompiledProblem(places, duration, start_date, end_date)
+
+
+def _populacao(tamanho: int, rng: random.Random) -> np.ndarray:
+    return np.array([rng.sample(range(TAMANHO), TAMANHO) for _ in range(tamanho)], dtype=np.int64)
+
+
+@pytest.mark.parametrize("time_min_daily", [240, 480])
+def test_batch_matches_scalar(problem, time_min_daily):
+    rng = random.Random(time_min_daily)
+    escalar = FitnessEvaluator(problem, time_min_daily)
+    lote = BatchFitnessEvaluator(problem, time_min_daily)
+    for _ in range(5):
+        populacao = _populacao(50, rng)
+        esperado, roteiros_esperados = escalar.evaluate_population(populacao)
+        obtido, roteiros = lote.evaluate_population(populacao)
+        assert obtido == pytest.approx(esperado)
+        assert roteiros == roteiros_esperados
+
+
+@pytest.mark.parametrize("operador", list(CROSSOVER_OPERATORS))
+@pytest.mark.parametrize("time_min_daily", [240, 480])
+def test_incremental_matches_scalar(problem, operador, time_min_daily):
+    rng = random.Random(time_min_daily)
+    random.seed(time_min_daily)
+    escalar = FitnessEvaluator(problem, time_min_daily)
+    incremental = IncrementalFitnessEvaluator(problem, time_min_daily)
+    pais = _populacao(20, rng)
+    incremental.evaluate_population(pais)
+
+    filhos = np.empty((40, TAMANHO), dtype=np.int64)
+    mascara = np.zeros(TAMANHO, dtype=bool)
+    linhagem = []
+    for i in range(0, len(filhos), 2):
+        p1, p2 = rng.sample(range(len(pais)), 2)
+        CROSSOVER_OPERATORS[operador](pais[p1], pais[p2], filhos[i], filhos[i + 1], mascara)
+        linhagem += [(pais[p1].tolist(), pais[p2].tolist())] * 2
+    # Mutação por troca, inclusive em cópias dos pais (prefixo longo em comum)
+    filhos[-4:] = pais[:4]
+    for filho in filhos[::3]:
+        a, b = rng.sample(range(TAMANHO), 2)
+        filho[a], filho[b] = filho[b], filho[a]
+    linhagem[-4:] = [(pai.tolist(),) for pai in pais[:4]]
+
+    esperado, roteiros_esperados = escalar.evaluate_population(filhos)
+    obtido, roteiros = incremental.evaluate_population(filhos, linhagem)
+    assert obtido == pytest.approx(esperado)
+    assert roteiros == roteiros_esperados
+    assert incremental.genes_reaproveitados > 0
+
+
+@pytest.mark.parametrize("time_min_daily", [240, 480])
+def test_segment_matches_scalar(problem, time_min_daily):
+    rng = random.Random(time_min_daily)
+    escalar = FitnessEvaluator(problem, time_min_daily)
+    segmentos = SegmentFitnessEvaluator(problem, time_min_daily)
+    populacao = _populacao(50, rng)
+    # Segunda passada com a mesma população: os dias vêm do cache
+    for _ in range(2):
+        esperado, roteiros_esperados = escalar.evaluate_population(populacao)
+        obtido, roteiros = segmentos.evaluate_population(populacao)
+        assert obtido == pytest.approx(esperado)
+        assert roteiros == roteiros_esperados
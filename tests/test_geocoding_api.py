@@ -0,0 +1,18 @@
+from core.api.google.geocoding_api import GeoCodingClient
+
+
+def test_clients_share_the_rate_limiter():
+    primeiro = GeoCodingClient(use_cache=False)
+    segundo = GeoCodingClient(use_cache=False)
+
+    assert primeiro.rate_limiter is segundo.rate_limiter
+    assert primeiro.session is segundo.session
+
+
+def test_rate_limit_spans_clients():
+    # Reservas feitas por clientes diferentes ocupam intervalos consecutivos do mesmo limitador
+    clientes = [GeoCodingClient(use_cache=False, requests_per_second=10) for _ in range(3)]
+    esperas = [cliente.rate_limiter._reserve() for cliente in clientes]
+
+    assert esperas[1] >= 0.09 and esperas[2] >= 0.19
+
@@ -0,0 +1,34 @@
+import time
+from core.utils.persistent_cache import PersistentCache
+
+
+def test_round_trip_and_expiry(tmp_path):
+    cache = PersistentCache("pares", ttl_seconds=60, path=str(tmp_path / "cache.sqlite"))
+    cache.set_many({"a": [1, 2], "b": {"x": 1}})
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": [1, 2], "b": {"x": 1}}
+    assert cache.get("c") is None
+
+
+def test_caches_on_the_same_file_share_one_connection(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    rotas = PersistentCache("rotas", ttl_seconds=60, path=path)
+    geocodificacao = PersistentCache("geocodificacao", ttl_seconds=60, path=path)
+    outro = PersistentCache("rotas", ttl_seconds=60, path=str(tmp_path / "outro.sqlite"))
+
+    assert rotas._connection is geocodificacao._connection
+    assert rotas._connection is not outro._connection
+
+
+def test_expired_entries_are_purged_when_the_namespace_is_opened(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    PersistentCache("expira", ttl_seconds=0, path=path).set("velho", 1)
+    time.sleep(0.01)
+
+    # Abertura em um novo processo: simulada esquecendo que o namespace já foi limpo
+    from core.utils import persistent_cache
+    persistent_cache._purged.clear()
+    cache = PersistentCache("expira", ttl_seconds=60, path=path)
+
+    linhas = cache._connection.execute("SELECT COUNT(*) FROM expira").fetchone()[0]
+    assert linhas == 0
@@ -0,0 +1,74 @@
+import json
+import httpx
+import asyncio
+import pytest
+from collections import Counter
+from core.utils.persistent_cache import PersistentCache
+from core.api.google.routes_api import RoutesClient
+
+
+def _element(i, j, condition="ROUTE_EXISTS", duration="600s", distance=800):
+    element = {"originIndex": i, "destinationIndex": j, "condition": condition}
+    if condition == "ROUTE_EXISTS":
+        element.update(duration=duration, distanceMeters=distance)
+    return element
+
+
+def test_parse_elements_skips_routes_not_found():
+    pairs = RoutesClient._parse_elements([
+        _element(0, 1),
+        _element(1, 0, condition="ROUTE_NOT_FOUND"),
+        {"originIndex": 1, "destinationIndex": 1},
+    ])
+
+    assert pairs == {(0, 1): (10, 800), (1, 0): None, (1, 1): None}
+
+
+def test_routes_not_found_are_not_cached(tmp_path):
+    cache = PersistentCache("route_matrix", ttl_seconds=60, path=str(tmp_path / "cache.sqlite"))
+    client = RoutesClient(cache=cache)
+    coordinates = [(35.0, 135.0), (35.1, 135.1)]
+    matrix = [[None, None], [None, None]]
+
+    client._store_pairs(coordinates, matrix, [0, 1], [0, 1], {(0, 1): (10, 800), (1, 0): None})
+
+    assert matrix == [[None, (10, 800)], [None, None]]
+    chaves = [client._pair_key(coordinates[0], coordinates[1]), client._pair_key(coordinates[1], coordinates[0])]
+    assert list(cache.get_many(chaves)) == [chaves[0]]
+
+
+def _fake_routes_server(requisicoes: list[tuple[list, list]]) -> httpx.MockTransport:
+    # Responde a computeRouteMatrix com uma rota para cada par e registra os pares pedidos
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        ponto = lambda w: tuple(w["waypoint"]["location"]["latLng"].values())
+        origens = [ponto(w) for w in body["origins"]]
+        destinos = [ponto(w) for w in body["destinations"]]
+        requisicoes.append((origens, destinos))
+        return httpx.Response(200, json=[
+            _element(i, j) for i in range(len(origens)) for j in range(len(destinos))
+        ])
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.parametrize("travel_mode, limite", [("WALK", 625), ("TRANSIT", 100)])
+def test_tiles_cover_every_pair_once_within_the_element_limit(travel_mode, limite, monkeypatch):
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "test-key")
+    n = 110
+    coordinates = [(35.0 + i * 1e-3, 135.0 + i * 1e-3) for i in range(n)]
+    matrix = [[None] * n for _ in range(n)]
+    requisicoes = []
+    client = RoutesClient(travel_mode=travel_mode, use_cache=False)
+    assert client.max_elements == limite
+
+    async def buscar():
+        async with httpx.AsyncClient(transport=_fake_routes_server(requisicoes)) as http:
+            await client.fill_block_async(http, coordinates, matrix, range(n), range(n), asyncio.Semaphore(8))
+
+    asyncio.run(buscar())
+
+    pares = Counter((o, d) for origens, destinos in requisicoes for o in origens for d in destinos)
+    assert len(pares) == n * n and set(pares.values()) == {1}
+    assert all(len(origens) * len(destinos) <= limite for origens, destinos in requisicoes)
+    assert all(value == (10, 800) for row in matrix for value in row)
@@ -0,0 +1,107 @@
+import time
+import random
+import logging
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from benchmarks.synthetic import make_problem, trip_dates
+from core.genetic import genetic_algorithm, seeding
+from core.genetic.compiled_problem import CompiledProblem
+from core.genetic.genetic_algorithm import SEEDING_BUDGET_SHARE, TravelGeneticAlgorithm
+from core.genetic.seeding import SEEDING_HEURISTICS, seed_individuals
+
+
+@pytest.fixture(scope="module")
+def problem():
+    places, duration, _ = make_problem(200, seed=1)
+    start_date, end_date = trip_dates(200)
+    return CompiledProblem(places, duration, start_date, end_date)
+
+
+@pytest.mark.parametrize("nome", list(SEEDING_HEURISTICS))
+@pytest.mark.parametrize("aleatorio", [False, True])
+def test_heuristics_return_permutations(problem, nome, aleatorio):
+    random.seed(0)
+    individuo = SEEDING_HEURISTICS[nome](problem, 480, aleatorio)
+    assert sorted(individuo) == list(range(problem.size))
+
+
+@pytest.mark.parametrize("nome", list(SEEDING_HEURISTICS))
+def test_heuristics_interrupted_by_deadline_return_permutations(problem, nome):
+    individuo = SEEDING_HEURISTICS[nome](problem, 480, False, time.perf_counter())
+    assert sorted(individuo) == list(range(problem.size))
+
+
+def test_seed_individuals_are_distinct(problem):
+    random.seed(0)
+    individuos = seed_individuals(problem, 480, 6)
+    assert len(individuos) == 6
+    assert len({tuple(individuo) for individuo in individuos}) == 6
+
+
+@pytest.fixture
+def chamadas(monkeypatch):
+    # Heurísticas que registram cada chamada
+    registro = []
+    for nome, heuristica in list(SEEDING_HEURISTICS.items()):
+        def registrar(*args, _nome=nome, _heuristica=heuristica):
+            registro.append(_nome)
+            return _heuristica(*args)
+        monkeypatch.setitem(SEEDING_HEURISTICS, nome, registrar)
+    return registro
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    # Relógio da semeadura adiantável: `relogio[0]` segundos à frente do real
+    adiantamento = [0.0]
+    monkeypatch.setattr(seeding, "time", SimpleNamespace(perf_counter=lambda: time.perf_counter() + adiantamento[0]))
+    return adiantamento
+
+
+def test_seed_individuals_stops_at_deadline(problem, chamadas):
+    assert seed_individuals(problem, 480, 6, time.perf_counter()) == []
+    assert chamadas == []
+
+
+def test_deadline_during_seeding_starts_no_new_heuristic(problem, chamadas, relogio, monkeypatch):
+    primeira = list(SEEDING_HEURISTICS)[0]
+    heuristica = SEEDING_HEURISTICS[primeira]
+
+    def expirar(*args):
+        # O prazo passa durante a primeira heurística
+        relogio[0] = 3600.0
+        return heuristica(*args)
+    monkeypatch.setitem(SEEDING_HEURISTICS, primeira, expirar)
+
+    individuos = seed_individuals(problem, 480, 6, time.perf_counter() + 60)
+    assert chamadas == [primeira]
+    assert len(individuos) == 1
+    assert sorted(individuos[0]) == list(range(problem.size))
+
+
+def test_seeding_uses_share_of_time_budget(chamadas, relogio, monkeypatch):
+    logging.disable(logging.CRITICAL)
+    places, duration, distance = make_problem(100, seed=42)
+    start_date, end_date = trip_dates(100)
+    ga = TravelGeneticAlgorithm(places, duration, distance,
+                                population_size=50, generations=10,
+                                mutation_rate=0.1, crossover_rate=0.8, time_min_daily=480,
+                                start_date=start_date, end_date=end_date,
+                                time_budget_ms=600, seed_ratio=0.2)
+    prazos = []
+
+    def semear(problem, time_min_daily, quantidade, deadline=None):
+        prazos.append(deadline - time.perf_counter())
+        # O prazo já passou quando a semeadura começa: a população é completada ao acaso
+        relogio[0] = 3600.0
+        return seed_individuals(problem, time_min_daily, quantidade, deadline)
+    monkeypatch.setattr(genetic_algorithm, "seed_individuals", semear)
+
+    random.seed(0)
+    populacao = ga._initialize_population()
+    logging.disable(logging.NOTSET)
+
+    assert 0 < prazos[0] <= 0.6 * SEEDING_BUDGET_SHARE
+    assert chamadas == [] and ga.seeded_size == 0
+    assert (np.sort(populacao, axis=1) == np.arange(len(places))).all()
@@ -0,0 +1,117 @@
+import logging
+import pytest
+import pandas as pd
+from benchmarks.synthetic import make_problem, trip_dates
+from core.api.estimated_routes_api import EstimatedRoutesClient
+from core.services.travel_planner_controller import MATRIX_PROVIDERS, TravelPlannerController
+
+
+@pytest.fixture(autouse=True)
+def sem_logs():
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture
+def trip():
+    places, duration, distance = make_problem(12, seed=1)
+    return places, duration, distance, *trip_dates(12)
+
+
+def test_ga_runs_after_deleting_a_place(trip):
+    places, duration, distance, start_date, end_date = trip
+    controller = TravelPlannerController()
+    editados = places.drop(index=3)
+
+    duration, distance, matrix_places = controller.update_travel_matrices(editados, duration, distance, None,
+                                                                          "estimate", places)
+    assert matrix_places.index.tolist() == list(range(len(editados)))
+    assert list(duration.index) == matrix_places["places"].tolist()
+
+    # Também com o índice com lacunas vindo direto do editor
+    for df_places in (matrix_places, editados):
+        resultado = controller.run_genetic_algorithm(df_places, duration, distance, 20, 5, 0.1, 0.8, 480,
+                                                     start_date, end_date, use_cache=False)
+        assert sorted(resultado["melhor_individuo_idx"]) == list(range(len(editados)))
+
+
+def test_moved_place_is_refetched(trip, monkeypatch):
+    places, duration, distance, _, _ = trip
+    controller = TravelPlannerController()
+    recebidas = []
+
+    class RecordingClient(EstimatedRoutesClient):
+        def update_duration_and_distance(self, places_df, duration_df, distance_df):
+            recebidas.append(list(duration_df.index))
+            return super().update_duration_and_distance(places_df, duration_df, distance_df)
+
+    monkeypatch.setitem(MATRIX_PROVIDERS, "estimate", RecordingClient)
+    editados = places.copy()
+    editados.loc[2, "latitude"] += 0.05
+    nome = editados.loc[2, "places"]
+
+    controller.update_travel_matrices(editados, duration, distance, None, "estimate", places)
+
+    # Os pares do local movido não são reaproveitados; os demais são
+    assert recebidas == [[local for local in duration.index if local != nome]]
+
+
+def test_unchanged_places_keep_matrices(trip):
+    places, duration, distance, _, _ = trip
+    controller = TravelPlannerController()
+
+    novo_duration, novo_distance, _ = controller.update_travel_matrices(places, duration, distance, None,
+                                                                         "estimate", places)
+
+    assert novo_duration is duration and novo_distance is distance
+
+
+def test_provider_change_recomputes_all_pairs(trip, monkeypatch):
+    places, _, _, _, _ = trip
+    controller = TravelPlannerController()
+    chamadas = []
+
+    class FakeRoutesClient(EstimatedRoutesClient):
+        def compute_duration_and_distance(self, places_df):
+            chamadas.append("compute")
+            duration, distance = super().compute_duration_and_distance(places_df)
+            return duration + 1, distance + 1
+
+        def update_duration_and_distance(self, places_df, duration_df, distance_df):
+            chamadas.append("update")
+            return super().update_duration_and_distance(places_df, duration_df, distance_df)
+
+    monkeypatch.setitem(MATRIX_PROVIDERS, "routes", FakeRoutesClient)
+    rascunho = EstimatedRoutesClient().compute_duration_and_distance(places)
+
+    # Mesmos locais, mas o rascunho estimado passa para a Routes API: nada é reaproveitado
+    duration, _, _ = controller.update_travel_matrices(places, *rascunho, None, "routes", places, "estimate")
+    assert chamadas == ["compute"]
+    assert (duration.to_numpy() == rascunho[0].to_numpy() + 1).all()
+
+    # Com o mesmo provedor, as matrizes continuam valendo
+    mesmas, _, _ = controller.update_travel_matrices(places, duration, duration, None, "routes", places, "routes")
+    assert mesmas is duration and chamadas == ["compute"]
+
+
+def test_text_flow_keeps_hotel_out_of_places(trip):
+    # Fluxo por texto: os locais não têm a linha HOTEL; o hotel vem em `hotel_coordinates`
+    places, duration, distance, start_date, end_date = trip
+    hotel = places.iloc[0]
+    sugeridos = places.iloc[1:]
+    novo = sugeridos.iloc[[0]].assign(places="Novo local", latitude=hotel["latitude"] + 0.01)
+    editados = pd.concat([sugeridos.drop(index=3), novo])
+    controller = TravelPlannerController()
+
+    for anteriores in (None, sugeridos):
+        duration_novo, distance_novo, matrix_places = controller.update_travel_matrices(
+            editados, duration, distance, (hotel["latitude"], hotel["longitude"]), "estimate", anteriores)
+        assert matrix_places["places"].tolist() == editados["places"].tolist()
+        assert matrix_places.index.tolist() == list(range(len(editados)))
+        assert set(duration_novo.index) == {"HOTEL", *editados["places"]}
+
+        resultado = controller.run_genetic_algorithm(matrix_places, duration_novo, distance_novo, 20, 5, 0.1, 0.8,
+                                                     480, start_date, end_date, use_cache=False)
+        assert "HOTEL" not in resultado["melhor_individuo_nomes"]
+        assert sorted(resultado["melhor_individuo_idx"]) == list(range(len(editados)))